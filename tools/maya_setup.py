@@ -1,6 +1,4 @@
 import sys
-import subprocess
-import maya.cmds as cmds
 import os
 import winreg
 
@@ -93,16 +91,6 @@ tools_dir = os.path.dirname(__file__)
 if tools_dir not in sys.path:
     sys.path.append(tools_dir)
 
-try:
-    import requests
-except:
-    maya_version = cmds.about(version=True)
-
-    mayapy_path = os.path.join("C:\\Program Files", "Autodesk", f"Maya{maya_version}", "bin", "mayapy.exe")
-    subprocess.check_call([mayapy_path, "-m", "ensurepip", "--upgrade"])
-    subprocess.check_call([mayapy_path, "-m", "pip", "install", "--upgrade", "pip"])
-    subprocess.check_call([mayapy_path, "-m", "pip", "install", "requests"])
-
 update_maya_script_path(tools_dir)
 add_tools_to_user_setup(tools_dir)
 from maya_tools import maya_menu; maya_menu.create_menu_once()
\ No newline at end of file
@@ -44,6 +44,8 @@ script_dir = os.path.dirname(__file__).replace('\\', '/')
 
 CINEMATIC_FOLDER = "Cinematics"
 GAMEPLAY_FOLDER = "Gameplay"
+# Milliseconds between checks of the project catalogue's stamp
+CATALOGUE_POLL_MS = 5000
 
 class ExportHelper(QtCore.QObject):
     progress_update = QtCore.Signal(int)
@@ -61,6 +63,7 @@ class AnimationEntryError(Exception):
 
 class AnimationManagerUI(QtWidgets.QDialog):
     file_opened = QtCore.Signal()
+    skeletons_loaded = QtCore.Signal(object)
     def __init__(self, parent=None):
         if is_maya():
             parent = wrapInstance(sequence_utils.get_main_window_pointer(), QtWidgets.QMainWindow)
@@ -110,12 +113,18 @@ class AnimationManagerUI(QtWidgets.QDialog):
         self.log_path = ''
         self.cmd_path = ''
         self.namespace_skeleton_map = {}
+        self.catalogue_stamp = None
         self.export_node = sequence_utils.export_node_exists()
         self.menu_bar = QtWidgets.QMenuBar(self)
 
+        self.skeletons_loaded.connect(self.set_skeleton_list)
         self.init_ui()
         self.file_opened.connect(self._on_file_open_completed)
 
+        self.catalogue_timer = QtCore.QTimer(self)
+        self.catalogue_timer.timeout.connect(self.check_catalogue)
+        self.catalogue_timer.start(CATALOGUE_POLL_MS)
+
         sequence_utils.add_file_open_callback(self)
 
     def init_ui(self):
@@ -227,6 +236,10 @@ class AnimationManagerUI(QtWidgets.QDialog):
             self.table_widget.clear()
             self.anim_dict, self.skeletons, self.uproject, self.export_dir = self.load_data()
 
+        catalogue_skeletons = self.get_catalogue_skeletons()
+        if catalogue_skeletons:
+            self.skeletons = catalogue_skeletons
+
         if not self.skeletons:
             if not self.uproject or os.path.exists(os.path.dirname(self.uproject)):
                 self.uproject = self.get_uproject("C:/")
@@ -392,17 +405,66 @@ class AnimationManagerUI(QtWidgets.QDialog):
             self.table_widget.selectRow(row)
             self.apply_row_colors(color_to_use)
 
+    def get_unreal_skeletons(self):
+        """
+        Asks Unreal for the project's skeletons
+        :return: skeleton name -> info dictionary, empty if Unreal could not be reached
+        """
+        skel_data = usp.run_get_skeletons(self.uproject, self.log_path, self.cmd_path)
+        if not isinstance(skel_data, dict):
+            print(f"Could not get skeletons from Unreal: {skel_data}")
+            return {}
+        return skel_data
+
+    def get_catalogue_skeletons(self):
+        """
+        Reads the skeletons from the catalogue Unreal keeps next to the uproject, without Unreal having to be up
+        :return: skeleton name -> info dictionary, None if the project has no catalogue yet
+        """
+        catalogue = upd.read_project_catalogue(self.uproject) if self.uproject else None
+        if not catalogue:
+            return None
+        self.catalogue_stamp = catalogue["stamp"]
+        return catalogue["skeletons"]
+
+    def check_catalogue(self):
+        """
+        Timer callback, reloads the skeleton list when Unreal has written a new catalogue
+        :return:
+        """
+        catalogue = upd.read_project_catalogue(self.uproject) if self.uproject else None
+        if catalogue and catalogue["stamp"] != self.catalogue_stamp:
+            self.catalogue_stamp = catalogue["stamp"]
+            self.set_skeleton_list(catalogue["skeletons"])
+
+    def fetch_unreal_skeletons(self):
+        """
+        Runs on a background thread, hands the skeletons back to the UI thread through skeletons_loaded
+        :return:
+        """
+        skeletons = self.get_unreal_skeletons()
+        if skeletons:
+            self.skeletons_loaded.emit(skeletons)
+
     def update_skeleton_list(self):
         """
-        Function to reload the skeleton list from the uproject without having to reselect project
+        Function to reload the skeleton list from the uproject without having to reselect project.
+        The catalogue is shown right away while Unreal is asked on a background thread
+        :return:
+        """
+        catalogue_skeletons = self.get_catalogue_skeletons()
+        if catalogue_skeletons:
+            self.set_skeleton_list(catalogue_skeletons)
+        threading.Thread(target=self.fetch_unreal_skeletons, daemon=True).start()
+
+    def set_skeleton_list(self, skeletons):
+        """
+        Replaces the skeleton list, keeping the current skeleton selected if it is still there
+        :param skeletons: skeleton names, or name -> info dictionary
         :return:
         """
         current_skel = self.skeleton_input.currentText()
-        skel_data = usp.run_get_skeletons(self.uproject, self.log_path, self.cmd_path)
-        if type(skel_data) == str:
-            self.skeletons = eval(skel_data)
-        else:
-            self.skeletons = skel_data
+        self.skeletons = skeletons
         self.skeleton_input.clear()
         self.skeleton_input.addItems(self.skeletons)
 
@@ -976,6 +1038,18 @@ class AnimationManagerUI(QtWidgets.QDialog):
         def on_progress_update_text(string_text):
             progress_bar.label.setText(string_text)
 
+        def on_unreal_progress(progress):
+            # Progress payloads yielded by the Unreal import as each animation and shot completes
+            total = progress.get("total_animations") or 1
+            helper.progress_update.emit(int(progress.get("completed_animations", 0) / total * 100))
+            if progress.get("stage") == "import" and progress.get("animation") is None:
+                helper.progress_update_text.emit(f"Unreal Import: {progress.get('reimported', 0)} imported, "
+                                                 f"{progress.get('skipped', 0)} unchanged")
+            elif progress.get("animation"):
+                helper.progress_update_text.emit(f"Unreal Import Completed for: {os.path.basename(progress['animation'])}")
+            elif progress.get("shot"):
+                helper.progress_update_text.emit(f"Unreal Shot Completed: {progress['shot']}")
+
         helper.progress_update.connect(on_progress_update)
         helper.progress_update_text.connect(on_progress_update_text)
         helper.finished.connect(on_exports_complete)
@@ -1043,26 +1117,35 @@ class AnimationManagerUI(QtWidgets.QDialog):
 
                     QtWidgets.QApplication.processEvents()
 
-            helper.finished.emit()
             # Once all exports are done, then launches unreal. Maya File must be a saved path.
             # Since the maya exports are on their own thread, we need to wait for them to finish
-            if scene_path:
-                export_dir = os.path.dirname(export_path)
-                json_dir = os.path.join(export_dir, "JSON")
-                os.makedirs(json_dir, exist_ok=True)
-                scene_name = os.path.splitext(os.path.basename(scene_path))[0]
-                json_path = os.path.join(json_dir, scene_name + '.json').replace('\\', '/')
-
-                if cinematic:
-                    sequence_dict = sequence_utils.generate_sequence_dict_from_anim_dict(selected_anim_dict)
-                    json_data.save_dict_to_json(sequence_dict, json_path)
-                    if self.unreal_checkbox.isChecked():
-                        usp.run_create_cinematic_sequence(json_path, "/Game/" + CINEMATIC_FOLDER,
-                                                      self.uproject, self.log_path, self.cmd_path)
-                else:
-                    json_data.save_dict_to_json(selected_anim_dict, json_path)
+            # The progress bar stays open through the Unreal import and follows its progress
+            try:
+                if scene_path:
+                    export_dir = os.path.dirname(export_path)
+                    json_dir = os.path.join(export_dir, "JSON")
+                    os.makedirs(json_dir, exist_ok=True)
+                    scene_name = os.path.splitext(os.path.basename(scene_path))[0]
+                    json_path = os.path.join(json_dir, scene_name + '.json').replace('\\', '/')
+
                     if self.unreal_checkbox.isChecked():
-                        usp.run_import_gameplay_animations(json_path, self.uproject, self.log_path, self.cmd_path)
+                        helper.progress_update.emit(0)
+                        helper.progress_update_text.emit("Importing into Unreal...")
+
+                    if cinematic:
+                        sequence_dict = sequence_utils.generate_sequence_dict_from_anim_dict(selected_anim_dict)
+                        json_data.save_dict_to_json(sequence_dict, json_path)
+                        if self.unreal_checkbox.isChecked():
+                            usp.run_create_cinematic_sequence(json_path, "/Game/" + CINEMATIC_FOLDER,
+                                                          self.uproject, self.log_path, self.cmd_path,
+                                                          on_progress=on_unreal_progress)
+                    else:
+                        json_data.save_dict_to_json(selected_anim_dict, json_path)
+                        if self.unreal_checkbox.isChecked():
+                            usp.run_import_gameplay_animations(json_path, self.uproject, self.log_path, self.cmd_path,
+                                                               on_progress=on_unreal_progress)
+            finally:
+                helper.finished.emit()
 
         if len(export_processes) and is_maya():
             thread = threading.Thread(target=launch_unreal_after_export, args=(export_processes, export_path))
@@ -1093,11 +1176,7 @@ class AnimationManagerUI(QtWidgets.QDialog):
         export_data.insert(0, anim_dict)
         if not is_maya():
             if self.uproject and not skeletons:
-                skel_data = usp.run_get_skeletons(self.uproject, self.log_path, self.cmd_path)
-                if type(skel_data) == str:
-                    self.skeletons = eval(skel_data)
-                else:
-                    self.skeletons = skel_data
+                self.skeletons = self.get_catalogue_skeletons()
             else:
                 self.skeletons = skeletons
         else:
@@ -0,0 +1,255 @@
+import unreal
+import os
+import time
+from unreal_tools import asset_registry_events
+
+# Asset classes whose changes can alter which meshes and blueprints use a skeleton
+SKELETON_INDEX_CLASSES = ("Skeleton", "SkeletalMesh", "Blueprint")
+# Without the registry delegates, assets made, renamed or deleted by hand in the editor are never reported.
+# The indexes are then rebuilt after this many seconds, and a lookup that misses scans again at most this often
+UNBOUND_INDEX_TTL = float(os.environ.get("TEW_UNBOUND_INDEX_TTL", 60.0))
+UNBOUND_MISS_RESCAN_SECONDS = float(os.environ.get("TEW_UNBOUND_MISS_RESCAN_SECONDS", 2.0))
+
+
+def is_unbound_index_expired(built_at, missed=False):
+    """
+    :param built_at: time.time() the index was built
+    :param missed: the lookup found nothing
+    :return: True if the registry delegates are not bound and the index is due a rebuild
+    """
+    if asset_registry_events.is_bound():
+        return False
+    age = time.time() - built_at
+    return age >= UNBOUND_INDEX_TTL or (missed and age >= UNBOUND_MISS_RESCAN_SECONDS)
+
+
+def get_asset_class(asset_data):
+    """
+    :return: the asset's class name, ie "AnimSequence", across engine versions
+    """
+    class_path = getattr(asset_data, "asset_class_path", None)
+    if class_path is not None:
+        return str(class_path.asset_name)
+    return str(asset_data.asset_class)
+
+
+def get_package_name(object_path):
+    """
+    :param object_path: "/Game/Folder/Asset.Asset" style object path
+    :return: "/Game/Folder/Asset"
+    """
+    return str(object_path).split(".")[0]
+
+
+def get_tag_package(tag_value):
+    """
+    :param tag_value: object reference from a registry tag, ie "/Script/Engine.Skeleton'/Game/Chars/SK_Hero.SK_Hero'"
+    :return: "/Game/Chars/SK_Hero", None for an empty reference
+    """
+    value = str(tag_value or "")
+    if "'" in value:
+        value = value.split("'")[1]
+    if not value or value == "None":
+        return None
+    return get_package_name(value)
+
+
+class AssetIndex(object):
+    """
+    Session wide lookup of assets by name, built from one registry scan and then kept current from the
+    asset registry's added / removed / renamed callbacks, so a name lookup no longer walks every asset.
+    Names are lower cased, each maps to its package paths grouped by asset class
+    """
+    def __init__(self):
+        self.names = {}
+        self.packages = {}
+        self.built = False
+        self.built_at = 0.0
+        self.stale = False
+
+    def build(self):
+        """
+        Scans the registry once, the same on disk assets find_uasset_path used to walk on every call
+        """
+        self.names = {}
+        self.packages = {}
+        asset_registry = unreal.AssetRegistryHelpers.get_asset_registry()
+        for asset_data in asset_registry.get_all_assets(True):
+            self.add(asset_data)
+
+        if not self.built:
+            asset_registry_events.bind_asset_registry_events()
+            asset_registry_events.add_listener(self.on_change)
+        self.built = True
+        self.built_at = time.time()
+        self.stale = False
+        unreal.log(f"Asset index built with {len(self.packages)} assets")
+
+    def add(self, asset_data):
+        package_name = str(asset_data.package_name)
+        if package_name in self.packages:
+            return
+        name = str(asset_data.asset_name).lower()
+        class_name = get_asset_class(asset_data)
+        self.packages[package_name] = (name, class_name)
+        self.names.setdefault(name, {}).setdefault(class_name, []).append(package_name)
+
+    def remove(self, package_name):
+        entry = self.packages.pop(package_name, None)
+        if not entry:
+            return
+        name, class_name = entry
+        classes = self.names.get(name, {})
+        paths = classes.get(class_name, [])
+        if package_name in paths:
+            paths.remove(package_name)
+        if not paths:
+            classes.pop(class_name, None)
+        if not classes:
+            self.names.pop(name, None)
+
+    def on_change(self, change_type, asset_data, old_object_path):
+        """
+        Asset registry listener, see asset_registry_events.add_listener
+        """
+        if asset_data is None or not asset_data.is_valid():
+            # Our own import code reports some changes without the asset, without the registry delegates
+            # there is no other way to hear about them, so the next lookup that misses scans again
+            if not asset_registry_events.is_bound():
+                self.stale = True
+            return
+
+        if change_type == "removed":
+            self.remove(str(asset_data.package_name))
+            return
+        if change_type == "renamed" and old_object_path:
+            self.remove(get_package_name(old_object_path))
+        self.add(asset_data)
+
+    def get_class(self, package_name):
+        """
+        :return: class name of the asset in the package, None if it isn't indexed
+        """
+        if not self.built or is_unbound_index_expired(self.built_at):
+            self.build()
+        entry = self.packages.get(str(package_name))
+        if not entry and is_unbound_index_expired(self.built_at, missed=True):
+            self.build()
+            entry = self.packages.get(str(package_name))
+        return entry[1] if entry else None
+
+    def find(self, name, class_name=None):
+        """
+        :param name: asset name, any case
+        :param class_name: only return assets of this class, ie "SkeletalMesh"
+        :return: package paths of the matching assets, in registry order per class
+        """
+        if not self.built or is_unbound_index_expired(self.built_at):
+            self.build()
+
+        classes = self.names.get(name.lower())
+        if not classes and (self.stale or is_unbound_index_expired(self.built_at, missed=True)):
+            self.build()
+            classes = self.names.get(name.lower())
+        if not classes:
+            return []
+
+        if class_name:
+            return list(classes.get(class_name, []))
+        return [path for paths in classes.values() for path in paths]
+
+
+class SkeletonIndex(object):
+    """
+    Reverse index from a skeleton to the skeletal meshes using it, and from a mesh to the blueprints using it.
+    Meshes come from the Skeleton tag the registry keeps for every SkeletalMesh and blueprints from the mesh's
+    referencers, so nothing is loaded to answer. Dropped whenever a skeleton, mesh or blueprint changes
+    """
+    def __init__(self):
+        self.skeleton_meshes = None
+        self.mesh_blueprints = {}
+        self.built_at = 0.0
+        self.listening = False
+
+    def build(self):
+        asset_registry = unreal.AssetRegistryHelpers.get_asset_registry()
+        skeletal_mesh_class_path = unreal.TopLevelAssetPath("/Script/Engine", "SkeletalMesh")
+        self.skeleton_meshes = {}
+        self.mesh_blueprints = {}
+        self.built_at = time.time()
+        for asset_data in asset_registry.get_assets_by_class(skeletal_mesh_class_path, True):
+            skeleton_path = get_tag_package(asset_data.get_tag_value("Skeleton"))
+            if skeleton_path:
+                self.skeleton_meshes.setdefault(skeleton_path, []).append(str(asset_data.package_name))
+
+        if not self.listening:
+            asset_registry_events.bind_asset_registry_events()
+            asset_registry_events.add_listener(self.on_change)
+            self.listening = True
+
+    def on_change(self, change_type, asset_data, old_object_path):
+        """
+        Asset registry listener, animation imports and other unrelated changes keep the index
+        """
+        if asset_data is not None and asset_data.is_valid() and get_asset_class(asset_data) not in SKELETON_INDEX_CLASSES:
+            return
+        self.skeleton_meshes = None
+        self.mesh_blueprints = {}
+
+    def get_skeletal_meshes(self, skeleton_path):
+        """
+        :param skeleton_path: package or object path of the skeleton
+        :return: package paths of the skeletal meshes using it
+        """
+        if self.skeleton_meshes is None or is_unbound_index_expired(self.built_at):
+            self.build()
+        skeletal_meshes = self.skeleton_meshes.get(get_package_name(skeleton_path))
+        if not skeletal_meshes and is_unbound_index_expired(self.built_at, missed=True):
+            self.build()
+            skeletal_meshes = self.skeleton_meshes.get(get_package_name(skeleton_path))
+        return list(skeletal_meshes or [])
+
+    def get_mesh_blueprints(self, mesh_path):
+        """
+        :return: package paths of the blueprints referencing the skeletal mesh, looked up once per mesh
+        """
+        if self.skeleton_meshes is None or is_unbound_index_expired(self.built_at):
+            self.build()
+        if mesh_path in self.mesh_blueprints and not self.mesh_blueprints[mesh_path] and \
+                is_unbound_index_expired(self.built_at, missed=True):
+            # A blueprint made by hand may use the mesh now, start over so its referencers are asked again
+            self.build()
+        if mesh_path not in self.mesh_blueprints:
+            asset_registry = unreal.AssetRegistryHelpers.get_asset_registry()
+            reference_options = unreal.AssetRegistryDependencyOptions(
+                include_soft_package_references=True,
+                include_hard_package_references=True,
+                include_searchable_names=True,
+                include_soft_management_references=False,
+                include_hard_management_references=False
+            )
+            blueprints = []
+            for referencer in asset_registry.get_referencers(mesh_path, reference_options) or []:
+                if asset_index.get_class(referencer) == "Blueprint":
+                    blueprints.append(str(referencer))
+            self.mesh_blueprints[mesh_path] = blueprints
+        return self.mesh_blueprints[mesh_path]
+
+    def get_blueprints(self, skeleton_path, mesh_string=None):
+        """
+        :param skeleton_path: package or object path of the skeleton
+        :param mesh_string: only follow skeletal meshes whose path contains this, ie the character name
+        :return: package paths of the blueprints using a skeletal mesh on the skeleton
+        """
+        blueprints = []
+        for mesh_path in self.get_skeletal_meshes(skeleton_path):
+            if mesh_string and mesh_string not in mesh_path:
+                continue
+            for blueprint_path in self.get_mesh_blueprints(mesh_path):
+                if blueprint_path not in blueprints:
+                    blueprints.append(blueprint_path)
+        return blueprints
+
+
+asset_index = AssetIndex()
+skeleton_index = SkeletonIndex()
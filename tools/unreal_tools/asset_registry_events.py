@@ -0,0 +1,85 @@
+import unreal
+
+# Asset registry delegates we listen to, when the running engine exposes them to python
+REGISTRY_DELEGATES = {
+    "on_asset_added": "added",
+    "on_asset_removed": "removed",
+    "on_asset_renamed": "renamed",
+}
+
+_listeners = []
+_bound = False
+change_counter = 0
+
+
+def add_listener(listener):
+    """
+    Registers a callable to run whenever assets are added, removed or renamed
+    :param listener: callable taking (change_type, asset_data, old_object_path)
+    """
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def remove_listener(listener):
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def get_change_counter():
+    """
+    :return: number of asset changes seen this session, a cheap stamp for anything cached from the registry
+    """
+    return change_counter
+
+
+def is_bound():
+    """
+    :return: True if the registry delegates are hooked, so every change arrives with its asset data
+    """
+    return _bound
+
+
+def notify_change(change_type, asset_data=None, old_object_path=None):
+    """
+    Bumps the change counter and tells every listener. Called from the registry delegates, and directly by
+    our own import code so caches are invalidated even when the delegates are not exposed to python
+    :param change_type: "added", "removed", "renamed" or "modified"
+    :param asset_data: unreal.AssetData for the asset that changed, if known
+    :param old_object_path: previous object path for renames
+    """
+    global change_counter
+    change_counter += 1
+    for listener in list(_listeners):
+        try:
+            listener(change_type, asset_data, old_object_path)
+        except Exception as e:
+            unreal.log_error(f"Asset registry listener failed: {e}")
+
+
+def bind_asset_registry_events():
+    """
+    Hooks the asset registry's added / removed / renamed delegates, once per session
+    :return: True if at least one delegate could be bound
+    """
+    global _bound
+    if _bound:
+        return True
+
+    asset_registry = unreal.AssetRegistryHelpers.get_asset_registry()
+    for delegate_name, change_type in REGISTRY_DELEGATES.items():
+        delegate = getattr(asset_registry, delegate_name, None)
+        if delegate is None:
+            continue
+
+        def on_registry_change(*args, change_type=change_type):
+            asset_data = args[0] if args else None
+            old_object_path = args[1] if len(args) > 1 else None
+            notify_change(change_type, asset_data, old_object_path)
+
+        delegate.add_callable(on_registry_change)
+        _bound = True
+
+    if not _bound:
+        unreal.log_warning("Asset registry delegates are not exposed, caches rely on import notifications and TTLs")
+    return _bound
@@ -0,0 +1,163 @@
+import threading
+
+# Histogram bucket upper bounds in milliseconds for the stages of a bridge call
+STAGE_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 300000)
+# Finer buckets for the time spent inside the tick callback on each editor frame
+TICK_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 33, 50, 100, 250, 1000)
+# Stages recorded for every registered function
+STAGES = ("queue_wait", "execution", "serialization")
+
+
+class Histogram(object):
+    """
+    Cumulative bucket histogram, the same shape Prometheus expects
+    """
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        for i, upper_bound in enumerate(self.buckets):
+            if value <= upper_bound:
+                self.bucket_counts[i] += 1
+                break
+
+    def cumulative_counts(self):
+        """
+        :return: list of [upper bound, observations at or below it], ending with +Inf
+        """
+        cumulative = []
+        running = 0
+        for upper_bound, bucket_count in zip(self.buckets, self.bucket_counts):
+            running += bucket_count
+            cumulative.append([upper_bound, running])
+        cumulative.append(["+Inf", self.count])
+        return cumulative
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "sum": round(self.total, 3),
+            "mean": round(self.total / self.count, 3) if self.count else 0.0,
+            "max": round(self.max, 3),
+            "buckets": self.cumulative_counts()
+        }
+
+
+class BridgeMetrics(object):
+    """
+    Queue wait, execution and serialization time per bridge function, queue depth and tick cost.
+    Written from both the HTTP threads and the game thread, so every update takes the lock
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stage_histograms = {}
+        self.tick_histogram = Histogram(TICK_BUCKETS_MS)
+        self.queue_depth = 0
+        self.peak_queue_depth = 0
+        self.running_tasks = 0
+        self.counters = {"requests": 0, "rejected": 0, "cache_hits": 0, "coalesced": 0, "failed": 0}
+
+    def observe(self, function, stage, duration_ms):
+        """
+        :param function: dotted path of the registered function
+        :param stage: one of STAGES
+        :param duration_ms: time spent in that stage
+        """
+        with self.lock:
+            key = (function, stage)
+            if key not in self.stage_histograms:
+                self.stage_histograms[key] = Histogram(STAGE_BUCKETS_MS)
+            self.stage_histograms[key].observe(duration_ms)
+
+    def observe_tick(self, duration_ms):
+        with self.lock:
+            self.tick_histogram.observe(duration_ms)
+
+    def set_queue_depth(self, depth, running_tasks=None):
+        with self.lock:
+            self.queue_depth = depth
+            self.peak_queue_depth = max(self.peak_queue_depth, depth)
+            if running_tasks is not None:
+                self.running_tasks = running_tasks
+
+    def increment(self, counter, amount=1):
+        with self.lock:
+            self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def get_mean(self, function, stage):
+        """
+        :return: mean milliseconds recorded for the function's stage, None before the first observation
+        """
+        with self.lock:
+            histogram = self.stage_histograms.get((function, stage))
+            if not histogram or not histogram.count:
+                return None
+            return histogram.total / histogram.count
+
+    def to_dict(self):
+        with self.lock:
+            functions = {}
+            for (function, stage), histogram in sorted(self.stage_histograms.items()):
+                functions.setdefault(function, {})[stage] = histogram.to_dict()
+            return {
+                "queue_depth": self.queue_depth,
+                "peak_queue_depth": self.peak_queue_depth,
+                "running_tasks": self.running_tasks,
+                "counters": dict(self.counters),
+                "tick_ms": self.tick_histogram.to_dict(),
+                "functions": functions
+            }
+
+    def to_prometheus(self):
+        """
+        :return: metrics in the Prometheus text exposition format
+        """
+        with self.lock:
+            lines = ["# HELP bridge_stage_duration_ms Time per stage of a bridge call in milliseconds",
+                     "# TYPE bridge_stage_duration_ms histogram"]
+            for (function, stage), histogram in sorted(self.stage_histograms.items()):
+                labels = f'function="{function}",stage="{stage}"'
+                lines.extend(format_histogram("bridge_stage_duration_ms", labels, histogram))
+
+            lines.extend(["# HELP bridge_tick_duration_ms Time spent inside the tick callback per editor frame",
+                          "# TYPE bridge_tick_duration_ms histogram"])
+            lines.extend(format_histogram("bridge_tick_duration_ms", "", self.tick_histogram))
+
+            lines.extend(["# HELP bridge_queue_depth Tasks waiting in the request queue",
+                          "# TYPE bridge_queue_depth gauge",
+                          f"bridge_queue_depth {self.queue_depth}",
+                          "# HELP bridge_queue_depth_peak Most tasks seen waiting in the request queue",
+                          "# TYPE bridge_queue_depth_peak gauge",
+                          f"bridge_queue_depth_peak {self.peak_queue_depth}",
+                          "# HELP bridge_running_tasks Generator tasks being resumed across ticks",
+                          "# TYPE bridge_running_tasks gauge",
+                          f"bridge_running_tasks {self.running_tasks}"])
+
+            for counter, value in sorted(self.counters.items()):
+                lines.extend([f"# TYPE bridge_{counter}_total counter", f"bridge_{counter}_total {value}"])
+
+        return "\n".join(lines) + "\n"
+
+
+def format_histogram(name, labels, histogram):
+    """
+    :return: Prometheus text lines for one histogram
+    """
+    separator = "," if labels else ""
+    lines = []
+    for upper_bound, count in histogram.cumulative_counts():
+        lines.append(f'{name}_bucket{{{labels}{separator}le="{upper_bound}"}} {count}')
+    label_block = f"{{{labels}}}" if labels else ""
+    lines.append(f"{name}_sum{label_block} {round(histogram.total, 3)}")
+    lines.append(f"{name}_count{label_block} {histogram.count}")
+    return lines
+
+
+metrics = BridgeMetrics()
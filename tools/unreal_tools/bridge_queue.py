@@ -0,0 +1,149 @@
+import collections
+import queue
+import threading
+import time
+
+# Priority lanes in the order they are served
+PRIORITY_LANES = ("interactive", "normal", "bulk")
+DEFAULT_PRIORITY = "normal"
+
+
+class InvalidPriorityError(ValueError):
+    """
+    Raised for a priority that is not one of PRIORITY_LANES, the bridge answers it with a 400
+    """
+
+
+def validate_priority(priority):
+    """
+    :param priority: lane name from a request, or None
+    :raises InvalidPriorityError: when it names no lane
+    :return: the lane name, DEFAULT_PRIORITY when None
+    """
+    if priority is None:
+        return DEFAULT_PRIORITY
+    if priority not in PRIORITY_LANES:
+        raise InvalidPriorityError(f"Unknown priority '{priority}', expected one of {', '.join(PRIORITY_LANES)}")
+    return priority
+
+
+class PriorityRequestQueue(object):
+    """
+    Bounded task queue with one FIFO lane per priority, a drop-in for the queue.Queue calls the bridge makes.
+    Interactive tasks are always served first. Normal and bulk tasks move up one lane for every aging_seconds
+    they wait, up to the normal lane, so a steady stream of newer work can't starve them.
+    Tasks are the bridge's task dictionaries and need "__priority__" and "__queued_at__"
+    """
+    def __init__(self, maxsize, aging_seconds):
+        self.maxsize = maxsize
+        self.aging_seconds = aging_seconds
+        self.lanes = {lane: collections.deque() for lane in PRIORITY_LANES}
+        self.lock = threading.Lock()
+        self.not_empty = threading.Condition(self.lock)
+
+    def get_rank(self, task, now):
+        """
+        :return: the lane index the task is currently served at, after aging
+        """
+        lane_index = PRIORITY_LANES.index(task["__priority__"])
+        if lane_index == 0:
+            return 0
+        promoted = int((now - task["__queued_at__"]) / self.aging_seconds) if self.aging_seconds > 0 else 0
+        return max(1, lane_index - promoted)
+
+    def get_order_key(self, task, now):
+        return self.get_rank(task, now), task["__queued_at__"], task["__id__"]
+
+    def qsize(self):
+        with self.lock:
+            return sum(len(lane) for lane in self.lanes.values())
+
+    def empty(self):
+        return self.qsize() == 0
+
+    def put_nowait(self, task):
+        """
+        :raises queue.Full: when maxsize tasks are already waiting
+        """
+        with self.lock:
+            if self.maxsize > 0 and sum(len(lane) for lane in self.lanes.values()) >= self.maxsize:
+                raise queue.Full
+            self.lanes[task["__priority__"]].append(task)
+            self.not_empty.notify()
+
+    def get_nowait(self, can_start=None):
+        return self.get(block=False, can_start=can_start)
+
+    def get(self, block=True, timeout=None, can_start=None):
+        """
+        Pops the next task to serve, the oldest task of the best ranked lane
+        :param can_start: optional predicate, tasks it rejects are passed over and keep their place in the queue
+        :raises queue.Empty: when nothing is waiting and block is False, or timeout runs out.
+            Tasks can_start rejects count as nothing waiting
+        """
+        with self.not_empty:
+            if block:
+                if not self.not_empty.wait_for(lambda: any(self.lanes.values()), timeout):
+                    raise queue.Empty
+            elif not any(self.lanes.values()):
+                raise queue.Empty
+
+            now = time.time()
+            heads = []
+            for lane in self.lanes.values():
+                # Each lane is in queued order, so its first startable task is the one it would serve
+                head = next((task for task in lane if can_start is None or can_start(task)), None)
+                if head is not None:
+                    heads.append(head)
+            if not heads:
+                raise queue.Empty
+            task = min(heads, key=lambda head: self.get_order_key(head, now))
+            self.lanes[task["__priority__"]].remove(task)
+            return task
+
+    def remove(self, task):
+        """
+        Drops a waiting task, ie when its job is cancelled, so it stops holding a queue slot
+        :return: True if the task was still waiting
+        """
+        with self.lock:
+            lane = self.lanes[task["__priority__"]]
+            if task in lane:
+                lane.remove(task)
+                return True
+            return False
+
+    def promote(self, task, priority):
+        """
+        Moves a waiting task to a better lane, ie when an interactive call coalesces onto a queued bulk one
+        """
+        with self.lock:
+            if PRIORITY_LANES.index(priority) >= PRIORITY_LANES.index(task["__priority__"]):
+                return
+            lane = self.lanes[task["__priority__"]]
+            if task not in lane:
+                return
+            lane.remove(task)
+            task["__priority__"] = priority
+            # Keep the new lane in queued order
+            new_lane = self.lanes[priority]
+            index = len(new_lane)
+            while index > 0 and new_lane[index - 1]["__queued_at__"] > task["__queued_at__"]:
+                index -= 1
+            new_lane.insert(index, task)
+
+    def get_tasks_ahead(self, task):
+        """
+        :return: the tasks that will be served before this one if nothing else arrives, None if it is not waiting
+        """
+        with self.lock:
+            if task not in self.lanes[task["__priority__"]]:
+                return None
+            now = time.time()
+            waiting = [queued for lane in self.lanes.values() for queued in lane]
+        task_key = self.get_order_key(task, now)
+        return [queued for queued in waiting if self.get_order_key(queued, now) < task_key]
+
+    def get_lane_depths(self):
+        with self.lock:
+            return {lane: len(tasks) for lane, tasks in self.lanes.items()}
@@ -0,0 +1,92 @@
+import unreal
+import json
+import os
+import types
+import traceback
+from utilities.json_data import write_json_atomic
+
+# Environment variables naming a commandlet job's own argument and result files, set by unreal_subprocess
+SPEC_FILE_ENV = "TEW_JOB_SPEC"
+RESULT_FILE_ENV = "TEW_JOB_RESULT"
+# Environment variable with the job's id, progress is logged with it so the launcher can tail the log for it
+JOB_ID_ENV = "TEW_JOB_ID"
+
+
+def get_job_tag(job_id):
+    """
+    :return: text marking a job's progress lines in the Unreal log
+    """
+    return f"[TEWJob {job_id}]"
+
+
+def log_progress(progress):
+    """
+    Logs a progress payload tagged with this job's id, unreal_subprocess picks it up by tailing the log
+    :param progress: json serializable progress payload
+    """
+    job_id = os.environ.get(JOB_ID_ENV)
+    if job_id:
+        unreal.log(f"{get_job_tag(job_id)} {json.dumps(progress, default=str)}")
+
+
+def run_steps(steps, on_step=None):
+    """
+    Runs a step generator to completion in one go, for callers that aren't spreading it across bridge ticks.
+    Anything that isn't a generator is returned untouched, so a function's result can be passed in either way
+    :param steps: generator from one of the cooperative functions, or a plain result
+    :param on_step: optional callable given each progress payload, ie log_progress in a commandlet
+    :return: the generator's return value
+    """
+    if not isinstance(steps, types.GeneratorType):
+        return steps
+    while True:
+        try:
+            progress = next(steps)
+        except StopIteration as stop:
+            return stop.value
+        if on_step:
+            on_step(progress)
+
+
+def read_job_spec():
+    """
+    Reads the arguments unreal_subprocess wrote for this run. Every launch gets its own spec file,
+    so several commandlets can run side by side without overwriting each other's arguments
+    :return: argument dictionary
+    """
+    spec_path = os.environ.get(SPEC_FILE_ENV)
+    if not spec_path or not os.path.exists(spec_path):
+        raise ValueError(f"Missing job spec, {SPEC_FILE_ENV} is not set or the file does not exist: {spec_path}")
+
+    with open(spec_path, "r") as f:
+        return json.load(f)
+
+
+def write_result(result=None, error=None):
+    """
+    Writes a commandlet script's outcome for the process that launched it, which reads it as soon as the editor exits
+    :param result: json serializable result
+    :param error: error message if the script failed
+    :return: True if the launcher asked for a result file and it was written
+    """
+    result_path = os.environ.get(RESULT_FILE_ENV)
+    if not result_path:
+        return False
+
+    write_json_atomic({"result": result, "error": error}, result_path, default=str)
+    return True
+
+
+def run_job(function, *args, **kwargs):
+    """
+    Runs a commandlet script's entry point and records whatever it returns or raises as the job result
+    :param function: callable doing the script's work
+    :return: the function's result
+    """
+    try:
+        result = function(*args, **kwargs)
+    except Exception as e:
+        write_result(error=f"{e}\n{traceback.format_exc()}")
+        raise
+    write_result(result)
+    return result
@@ -0,0 +1,219 @@
+import unreal
+import os
+import hashlib
+import collections
+from unreal_tools import asset_registry_events
+from unreal_tools.commandlet_job import run_steps
+from unreal_tools.save_session import get_active_session
+
+# FBX files handed to the asset tools in each import_asset_tasks call
+IMPORT_BATCH_SIZE = int(os.environ.get("TEW_IMPORT_BATCH_SIZE", 16))
+# Files per import_asset_tasks call while the bridge tick runs the import, each call blocks the editor for one frame
+COOPERATIVE_BATCH_SIZE = int(os.environ.get("TEW_COOPERATIVE_IMPORT_BATCH_SIZE", 1))
+# Reimport every file even when its stamp matches, ie after an engine upgrade changed how FBX files import
+FORCE_REIMPORT = os.environ.get("TEW_FORCE_REIMPORT", "0") == "1"
+# Bump whenever build_import_options changes, so assets imported with the old options are imported again
+IMPORT_SETTINGS_VERSION = 1
+# Metadata tags stamped on every imported animation
+SOURCE_HASH_TAG = "TEW.SourceHash"
+IMPORT_SETTINGS_TAG = "TEW.ImportSettings"
+
+# (fbx path, mtime, size) -> content hash, so a file is only read once per session while it is unchanged
+file_hashes = {}
+
+
+def get_file_hash(file_path):
+    """
+    :return: sha1 of the file's content, None if it can't be read
+    """
+    try:
+        stat = os.stat(file_path)
+        key = (file_path, stat.st_mtime, stat.st_size)
+        if key not in file_hashes:
+            sha = hashlib.sha1()
+            with open(file_path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    sha.update(chunk)
+            file_hashes[key] = sha.hexdigest()
+        return file_hashes[key]
+    except OSError:
+        return None
+
+
+def get_import_batch_size(cooperative):
+    """
+    :param cooperative: the import is spread across bridge ticks, rather than run to completion in one go
+    :return: files to import per step
+    """
+    return COOPERATIVE_BATCH_SIZE if cooperative else IMPORT_BATCH_SIZE
+
+
+def get_import_settings(skeleton_path):
+    """
+    :return: text identifying the options a file would be imported with
+    """
+    return f"{IMPORT_SETTINGS_VERSION}:{skeleton_path}"
+
+
+def is_import_current(asset_path, source_hash, import_settings):
+    """
+    :return: True if the asset exists and was imported from this content with these settings
+    """
+    if not source_hash or not unreal.EditorAssetLibrary.does_asset_exist(asset_path):
+        return False
+    asset = unreal.EditorAssetLibrary.load_asset(asset_path)
+    if not asset:
+        return False
+    return unreal.EditorAssetLibrary.get_metadata_tag(asset, SOURCE_HASH_TAG) == source_hash and \
+        unreal.EditorAssetLibrary.get_metadata_tag(asset, IMPORT_SETTINGS_TAG) == import_settings
+
+
+def stamp_import(asset, source_hash, import_settings):
+    """
+    Records what the asset was imported from, read back by is_import_current
+    """
+    if source_hash:
+        unreal.EditorAssetLibrary.set_metadata_tag(asset, SOURCE_HASH_TAG, source_hash)
+        unreal.EditorAssetLibrary.set_metadata_tag(asset, IMPORT_SETTINGS_TAG, import_settings)
+
+
+def build_import_options(skeleton_path):
+    """
+    Creates the import options for importing an animation in Unreal Engine.
+
+    :param skeleton_path: Path to the skeleton asset for the animation.
+    :return: Unreal FBX import UI object with specified settings.
+    """
+    options = unreal.FbxImportUI()
+    options.original_import_type = unreal.FBXImportType.FBXIT_ANIMATION
+    options.import_animations = True
+    options.create_physics_asset = False
+    options.import_mesh = False
+    options.import_rigid_mesh = False
+    options.import_materials = False
+    options.import_textures = False
+    options.import_as_skeletal = False
+    options.skeleton = unreal.load_asset(skeleton_path)
+    options.anim_sequence_import_data.set_editor_property('import_uniform_scale', 1.0)
+    options.anim_sequence_import_data.set_editor_property("import_bone_tracks", True)
+    options.anim_sequence_import_data.set_editor_property('animation_length',
+                                                          unreal.FBXAnimationLengthImportType.FBXALIT_EXPORTED_TIME)
+    options.anim_sequence_import_data.set_editor_property('remove_redundant_keys', False)
+
+    return options
+
+
+class FbxBatchImporter(object):
+    """
+    Collects the animation FBX files for a sequence or gameplay json and imports them in grouped
+    import_asset_tasks calls. Options are built, and the skeleton loaded, once per skeleton.
+    reimported and skipped count the files imported and the unchanged ones reused
+    """
+    def __init__(self, batch_size=IMPORT_BATCH_SIZE, force=FORCE_REIMPORT):
+        self.batch_size = max(1, batch_size)
+        self.force = force
+        self.reimported = 0
+        self.skipped = 0
+        # fbx path -> [skeleton path, destination path, destination name], in the order they were added
+        self.imports = collections.OrderedDict()
+        self.options = {}
+
+    def add(self, fbx_path, skeleton_path, destination_path, destination_name):
+        """
+        Queues an FBX, the first destination given for a file is the one it is imported to
+        """
+        if fbx_path not in self.imports:
+            self.imports[fbx_path] = [skeleton_path, destination_path, destination_name]
+
+    def get_options(self, skeleton_path):
+        if skeleton_path not in self.options:
+            self.options[skeleton_path] = build_import_options(skeleton_path)
+        return self.options[skeleton_path]
+
+    def get_destination_paths(self):
+        """
+        :return: the content folders the queued files import into
+        """
+        return list(dict.fromkeys(destination_path for skeleton_path, destination_path, name in self.imports.values()))
+
+    def build_task(self, fbx_path, skeleton_path, destination_path, destination_name):
+        task = unreal.AssetImportTask()
+        task.set_editor_property('automated', True)
+        task.set_editor_property('filename', fbx_path)
+        task.set_editor_property('destination_path', destination_path)
+        task.set_editor_property('destination_name', destination_name)
+        task.set_editor_property('replace_existing', True)
+        # Saved after the import stamp is written, or by the open SaveSession
+        task.set_editor_property('save', False)
+        task.set_editor_property('options', self.get_options(skeleton_path))
+        return task
+
+    def iter_import(self):
+        """
+        Works through the queue batch_size files at a time, yielding progress after each batch, so one step never
+        checks or imports more than batch_size files. Files whose content and import settings match the stamp on
+        their existing asset are skipped and the asset is reused.
+        Inside a SaveSession the imported assets are left for its bulk save, otherwise each batch is saved together
+        :return: {fbx path: imported asset path}, once exhausted
+        """
+        unreal.SystemLibrary.execute_console_command(None, "Interchange.FeatureFlags.Import.FBX 0")
+        asset_tools = unreal.AssetToolsHelpers.get_asset_tools()
+        save_session = get_active_session()
+        total = len(self.imports)
+        imported = dict()
+        queue = list(self.imports.items())
+        for batch_start in range(0, len(queue), self.batch_size):
+            batch = []
+            for fbx_path, (skeleton_path, destination_path, destination_name) in \
+                    queue[batch_start:batch_start + self.batch_size]:
+                source_hash = get_file_hash(fbx_path)
+                import_settings = get_import_settings(skeleton_path)
+                asset_path = f"{destination_path}/{destination_name}"
+                if not self.force and is_import_current(asset_path, source_hash, import_settings):
+                    imported[fbx_path] = asset_path
+                    self.skipped += 1
+                    continue
+                batch.append([fbx_path, skeleton_path, destination_path, destination_name, source_hash, import_settings])
+            if not batch:
+                yield {"stage": "import", "animation": queue[batch_start][0], "completed_animations": len(imported),
+                       "total_animations": total}
+                continue
+
+            tasks = [self.build_task(*import_args[:4]) for import_args in batch]
+            asset_tools.import_asset_tasks(tasks)
+
+            imported_assets = []
+            for (fbx_path, skeleton_path, destination_path, destination_name, source_hash, import_settings), task \
+                    in zip(batch, tasks):
+                imported_paths = task.get_editor_property('imported_object_paths')
+                if imported_paths:
+                    asset_path = str(imported_paths[0]).split('.')[0]
+                else:
+                    asset_path = f"{destination_path}/{destination_name}"
+                    unreal.log_warning(f"Import reported no assets for {fbx_path}, expecting {asset_path}")
+                imported[fbx_path] = asset_path
+                self.reimported += 1
+
+                asset = unreal.EditorAssetLibrary.load_asset(asset_path)
+                if asset:
+                    stamp_import(asset, source_hash, import_settings)
+                    imported_assets.append(asset)
+                if save_session:
+                    save_session.add(destination_path, asset_path)
+                asset_registry_events.notify_change("modified", unreal.EditorAssetLibrary.find_asset_data(asset_path))
+
+            if imported_assets and not save_session:
+                unreal.EditorAssetLibrary.save_loaded_assets(imported_assets, only_if_is_dirty=False)
+            yield {"stage": "import", "animation": batch[-1][0], "completed_animations": len(imported),
+                   "total_animations": total}
+
+        unreal.log(f"FBX import: {self.reimported} imported, {self.skipped} unchanged and skipped")
+        yield {"stage": "import", "animation": None, "completed_animations": len(imported), "total_animations": total,
+               "reimported": self.reimported, "skipped": self.skipped}
+        return imported
+
+    def import_all(self):
+        """
+        :return: {fbx path: imported asset path}
+        """
+        return run_steps(self.iter_import())
@@ -1,7 +1,6 @@
 import unreal
 import sys
 import os
-import json
 
 
 def import_animations_from_json(anim_dict_path):
@@ -18,22 +17,21 @@ def import_animations_from_json(anim_dict_path):
     tools_dir = os.path.dirname(script_dir)
     sys.path.append(tools_dir)
 
-    from unreal_tools import sequence_importer
-    sequence_path = sequence_importer.import_gameplay_animations_from_json(anim_dict_path)
+    from unreal_tools import sequence_importer, commandlet_job, fbx_batch_import
+    # Cooperative only to log progress between steps, nothing else runs in the commandlet so batches stay full size
+    steps = sequence_importer.import_gameplay_animations_from_json(anim_dict_path, cooperative=True,
+                                                                   import_batch_size=fbx_batch_import.IMPORT_BATCH_SIZE)
+    sequence_path = commandlet_job.run_steps(steps, on_step=commandlet_job.log_progress)
     unreal.log(f"Imported Animations for : {sequence_path}")
     return sequence_path
 
 
-if __name__ == "__main__":
-    # Load the args
-    script_dir = os.path.dirname(__file__)
-    args_path = "C:/temp/gameplay_animation_args.json"
-
-    if not os.path.exists(args_path):
-        raise ValueError("Missing sequence_args.json")
-
-    with open(args_path, "r") as f:
-        args = json.load(f)
+def main():
+    """
+    Run by UnrealEditor-Cmd, takes the json path from its job spec
+    :return: the imported animation paths
+    """
+    args = commandlet_job.read_job_spec()
 
     anim_dict_path = args.get("anim_dict_path")
 
@@ -42,5 +40,12 @@ if __name__ == "__main__":
 
     unreal.log(f"Parsed anim_dict_path: {anim_dict_path}")
 
-    import_animations_from_json(anim_dict_path)
+    return import_animations_from_json(anim_dict_path)
+
+
+if __name__ == "__main__":
+    sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+    from unreal_tools import commandlet_job
+
+    commandlet_job.run_job(main)
 
@@ -1,4 +1,6 @@
 import unreal
+import sys
+import os
 
 
 def get_all_assets_of_type(type='Skeleton', directory="/Game/"):
@@ -17,5 +19,7 @@ def get_all_assets_of_type(type='Skeleton', directory="/Game/"):
 
 
 if __name__ == "__main__":
-    assets = get_all_assets_of_type(type='Skeleton', directory="/Game/")
-    print(assets)
+    sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+    from unreal_tools import commandlet_job
+
+    commandlet_job.run_job(get_all_assets_of_type, type='Skeleton', directory="/Game/")
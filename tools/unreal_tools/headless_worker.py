@@ -0,0 +1,188 @@
+import unreal
+import sys
+import os
+import json
+import time
+import queue
+import threading
+import importlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+script_dir = os.path.dirname(__file__)
+tools_dir = os.path.dirname(script_dir)
+sys.path.append(tools_dir)
+
+from unreal_tools.commandlet_job import run_steps
+from utilities.json_data import write_json_atomic
+
+# Functions the worker will run, the same ones the editor bridge exposes
+WORKER_FUNCTIONS = [
+    "unreal_tools.get_skeletons.get_all_assets_of_type",
+    "unreal_tools.sequence_importer.create_cinematic_sequence_from_json",
+    "unreal_tools.sequence_importer.import_gameplay_animations_from_json",
+    "unreal_tools.sequence_importer.import_shot_animations_from_json",
+    "unreal_tools.sequence_importer.run_import_plan_from_json",
+    "unreal_tools.project_catalogue.write_catalogue",
+]
+
+# Seconds without a request before the worker exits and frees the editor
+IDLE_TIMEOUT = float(os.environ.get("TEW_WORKER_IDLE_TIMEOUT", 900))
+# Where the worker writes its port and pid, so any DCC session can find it
+STATE_FILE = os.environ.get("TEW_WORKER_STATE_FILE")
+# Seconds a client may hold an idle keep-alive connection
+KEEP_ALIVE_TIMEOUT = 2
+# Seconds the main thread waits for a call before checking the idle timeout and shutdown again
+CALL_POLL_INTERVAL = 1.0
+
+worker_state = {"last_request": time.time(), "calls": 0, "stop": False}
+loaded_functions = {}
+# Calls handed from the HTTP threads to the main thread, which runs them one at a time. /ping is answered on the
+# HTTP threads, so a DCC session can tell the worker is alive while a long import is running
+call_queue = queue.Queue()
+
+
+def get_function(func_path):
+    """
+    :param func_path: dotted path, must be one of WORKER_FUNCTIONS
+    :return: the callable, imported once per worker
+    """
+    if func_path not in WORKER_FUNCTIONS:
+        raise ValueError(f"Function is not exposed through the headless worker: {func_path}")
+    if func_path not in loaded_functions:
+        module_path, func_name = func_path.rsplit(".", 1)
+        loaded_functions[func_path] = getattr(importlib.import_module(module_path), func_name)
+    return loaded_functions[func_path]
+
+
+def run_call(call):
+    """
+    Runs one call to completion, generator functions are exhausted since there is no editor tick to spread them over
+    :param call: {"function": "module.func", "args": [], "kwargs": {}}
+    :return: the function's result
+    """
+    func = get_function(call["function"])
+    unreal.log(f"[Worker] Calling function: {call['function']} with args={call.get('args', [])}")
+    return run_steps(func(*call.get("args", []), **call.get("kwargs", {})))
+
+
+class WorkerRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    timeout = KEEP_ALIVE_TIMEOUT
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        unreal.log(f"Worker HTTP: {format % args}")
+
+    def send_json(self, status, body):
+        payload = json.dumps(body, separators=(',', ':'), default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path.split('?')[0].rstrip('/') == '/ping':
+            self.send_json(200, {"alive": True, "pid": os.getpid(), "calls": worker_state["calls"]})
+        else:
+            self.send_json(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        worker_state["last_request"] = time.time()
+        try:
+            content_length = int(self.headers['Content-Length'])
+            data = json.loads(self.rfile.read(content_length).decode('utf-8'))
+            if self.path.rstrip('/') == '/shutdown':
+                worker_state["stop"] = True
+                self.send_json(200, {"stopping": True})
+                return
+
+            worker_state["calls"] += 1
+            pending = {"call": data, "result": None, "error": None, "done": threading.Event()}
+            call_queue.put(pending)
+            pending["done"].wait()
+            if pending["error"] is not None:
+                self.send_json(500, {"error": pending["error"]})
+            else:
+                self.send_json(200, pending["result"])
+        except Exception as e:
+            unreal.log_error(f"Worker call failed: {e}")
+            self.send_json(500, {"error": str(e)})
+        finally:
+            worker_state["last_request"] = time.time()
+
+
+def write_state(port):
+    if not STATE_FILE:
+        return
+    os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
+    write_json_atomic({"port": port, "pid": os.getpid(), "started_at": time.time()}, STATE_FILE)
+
+
+def clear_state():
+    if not STATE_FILE or not os.path.exists(STATE_FILE):
+        return
+    try:
+        with open(STATE_FILE, "r") as f:
+            if json.load(f).get("pid") != os.getpid():
+                # A newer worker has taken over this slot
+                return
+        os.remove(STATE_FILE)
+    except (OSError, ValueError):
+        pass
+
+
+def run_pending_call(pending):
+    """
+    Runs a call an HTTP thread queued and wakes it with the result, must be run on the main thread
+    :param pending: {"call", "result", "error", "done"} dictionary from WorkerRequestHandler.do_POST
+    """
+    try:
+        pending["result"] = run_call(pending["call"])
+    except Exception as e:
+        unreal.log_error(f"Worker call failed: {e}")
+        pending["error"] = str(e)
+    finally:
+        worker_state["last_request"] = time.time()
+        pending["done"].set()
+
+
+def run_worker():
+    """
+    Runs calls on the commandlet's main thread until nothing has been asked for IDLE_TIMEOUT seconds, requests
+    are served on their own threads. The editor, asset registry and imported tool modules stay loaded between calls
+    """
+    asset_registry = unreal.AssetRegistryHelpers.get_asset_registry()
+    if hasattr(asset_registry, "wait_for_completion"):
+        asset_registry.wait_for_completion()
+
+    # The DCC tools read the catalogue instead of asking, refresh it while the registry is loaded anyway
+    try:
+        get_function("unreal_tools.project_catalogue.write_catalogue")()
+    except Exception as e:
+        unreal.log_error(f"[Worker] Could not write the project catalogue: {e}")
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), WorkerRequestHandler)
+    server.daemon_threads = True
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    write_state(port)
+    unreal.log(f"[Worker] Headless worker {os.getpid()} listening on port {port}")
+
+    try:
+        while not worker_state["stop"] and time.time() - worker_state["last_request"] < IDLE_TIMEOUT:
+            try:
+                pending = call_queue.get(timeout=CALL_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            run_pending_call(pending)
+    finally:
+        clear_state()
+        server.shutdown()
+        server.server_close()
+        unreal.log(f"[Worker] Headless worker {os.getpid()} stopped after {worker_state['calls']} calls")
+
+
+if __name__ == "__main__":
+    run_worker()
@@ -1,21 +1,110 @@
 import threading
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 import unreal
 import sys
 import socket
 import json
 import queue
 import importlib
+import inspect
+import itertools
+import collections
+import gzip
 import os
 import time
+import types
 
 
 script_dir = os.path.dirname(__file__)
 tools_dir = os.path.dirname(script_dir)
 sys.path.append(tools_dir)
 
-# Shared queue between HTTP server and tick handler
-request_queue = queue.Queue()
+from unreal_tools import asset_registry_events, project_catalogue
+from unreal_tools.bridge_metrics import metrics
+from unreal_tools.commandlet_job import run_steps
+from unreal_tools.bridge_queue import (PriorityRequestQueue, PRIORITY_LANES, DEFAULT_PRIORITY, InvalidPriorityError,
+                                       validate_priority)
+
+# Requests are accepted concurrently, but every call still runs on the game thread through this queue
+MAX_QUEUED_REQUESTS = 64
+# Seconds a client is told to wait before retrying when the queue is full
+RETRY_AFTER_SECONDS = 2
+
+# Milliseconds of work the tick handler may do per editor frame before handing control back to the editor
+TICK_BUDGET_MS = float(os.environ.get("TEW_BRIDGE_TICK_BUDGET_MS", 8.0))
+
+# Seconds a normal or bulk task waits before moving up a priority lane, so it is never starved
+PRIORITY_AGING_SECONDS = float(os.environ.get("TEW_BRIDGE_PRIORITY_AGING_SECONDS", 10.0))
+
+# Shared queue between HTTP server and tick handler, interactive work is served first
+request_queue = PriorityRequestQueue(MAX_QUEUED_REQUESTS, PRIORITY_AGING_SECONDS)
+
+# Tasks whose function returned a generator, resumed a step at a time across ticks
+running_tasks = []
+# Round robin cursor into running_tasks, kept across ticks so a step that overruns the budget doesn't hand
+# the next tick to the same task again
+resume_index = 0
+task_ids = itertools.count(1)
+# Catalogue write the tick queued last, a new one is only queued once it is done
+catalogue_task = None
+
+# Dotted paths of the functions clients may call through the bridge, anything else is rejected
+EXPOSED_FUNCTIONS = [
+    "unreal_tools.get_skeletons.get_all_assets_of_type",
+    "unreal_tools.sequence_importer.create_cinematic_sequence_from_json",
+    "unreal_tools.sequence_importer.import_gameplay_animations_from_json",
+    "unreal_tools.sequence_importer.run_import_plan_from_json",
+    "unreal_tools.project_catalogue.write_catalogue",
+]
+
+# Read-only functions and how many seconds their results may be served from cache. Identical concurrent
+# calls to these share one execution, and the cache is dropped whenever the asset registry changes
+CACHEABLE_FUNCTIONS = {
+    "unreal_tools.get_skeletons.get_all_assets_of_type": 300,
+}
+
+# Functions that load levels, open sequences or hold a SaveSession across their steps. Their builds can't be
+# interleaved, so while one is running the others wait in the queue
+EXCLUSIVE_FUNCTIONS = {
+    "unreal_tools.sequence_importer.create_cinematic_sequence_from_json",
+    "unreal_tools.sequence_importer.import_gameplay_animations_from_json",
+    "unreal_tools.sequence_importer.run_import_plan_from_json",
+}
+
+# Default priority lane per function, a call can ask for another one with "priority" or X-Bridge-Priority
+FUNCTION_PRIORITIES = {
+    "unreal_tools.get_skeletons.get_all_assets_of_type": "interactive",
+    "unreal_tools.sequence_importer.create_cinematic_sequence_from_json": "bulk",
+    "unreal_tools.sequence_importer.import_gameplay_animations_from_json": "bulk",
+    "unreal_tools.sequence_importer.run_import_plan_from_json": "bulk",
+    "unreal_tools.project_catalogue.write_catalogue": "interactive",
+}
+
+# Dotted path -> registry entry, the callable is imported on first use and then served from here
+function_registry = {}
+registry_stats = {"hits": 0, "misses": 0}
+
+# Call key -> (expiry time, result) for cacheable functions, and call key -> task for calls still running
+result_cache = {}
+inflight_calls = {}
+cache_lock = threading.Lock()
+# Bumped on every invalidation, so a call that started before an asset change never caches its stale result
+cache_generation = 0
+
+# Every task is also a job that can be polled by id, the oldest finished jobs are dropped past this count
+JOB_HISTORY = 200
+jobs = collections.OrderedDict()
+jobs_lock = threading.Lock()
+# Seconds between keep-alive comments on an idle progress stream
+EVENT_STREAM_HEARTBEAT = 15
+
+# Response formats a client can ask for with the X-Bridge-Format header. Without it results stay pretty printed
+RESPONSE_FORMATS = ("pretty", "compact", "columnar")
+# Bodies smaller than this are sent uncompressed even when the client accepts gzip
+GZIP_MIN_BYTES = 1024
+
+# Seconds an idle keep-alive connection is held open before the server closes it
+KEEP_ALIVE_TIMEOUT = 30
 
 
 def import_function(func_path):
@@ -29,73 +118,796 @@ def import_function(func_path):
     return getattr(module, func_name)
 
 
-def tick(delta_time):
-    while not request_queue.empty():
-        task = request_queue.get()
+def register_function(func_path, function=None, cache_ttl=None, priority=None, exclusive=False):
+    """
+    Exposes a function to bridge clients. It is imported lazily the first time it is called
+    :param func_path: dotted path, ie "unreal_tools.get_skeletons.get_all_assets_of_type"
+    :param function: optional callable already in hand, so it is never imported by path
+    :param cache_ttl: seconds results may be cached, only for read-only functions. None disables caching
+    :param priority: default priority lane for calls to it, "interactive", "normal" or "bulk"
+    :param exclusive: True if it mutates the level, it then never runs alongside another exclusive function
+    """
+    if func_path not in function_registry:
+        function_registry[func_path] = {"function": function, "resolve_ms": None, "calls": 0,
+                                        "cache_ttl": cache_ttl, "priority": validate_priority(priority),
+                                        "exclusive": exclusive}
+
+
+def resolve_function(func_path):
+    """
+    Looks up a registered function, importing it only on the first call
+    :param func_path: dotted path the client asked for
+    :return: the callable
+    """
+    entry = function_registry.get(func_path)
+    if entry is None:
+        raise ValueError(f"Function is not exposed through the bridge: {func_path}")
+
+    entry["calls"] += 1
+    if entry["function"] is not None:
+        registry_stats["hits"] += 1
+        return entry["function"]
+
+    registry_stats["misses"] += 1
+    start = time.perf_counter()
+    entry["function"] = import_function(func_path)
+    entry["resolve_ms"] = round((time.perf_counter() - start) * 1000.0, 3)
+    unreal.log(f"[Bridge] Resolved {func_path} in {entry['resolve_ms']} ms")
+    return entry["function"]
+
+
+def describe_functions():
+    """
+    Lists the registered functions. Signatures are only given for functions already resolved, this runs on the
+    HTTP thread and must not import modules or touch the registry entries the tick is using
+    :return: dictionary with the function list and registry hit / miss counts
+    """
+    functions = []
+    for func_path in sorted(function_registry):
+        entry = function_registry[func_path]
+        description = {"name": func_path, "signature": None, "doc": None, "calls": entry["calls"],
+                       "resolve_ms": entry["resolve_ms"], "cache_ttl": entry["cache_ttl"],
+                       "priority": entry["priority"], "exclusive": entry["exclusive"]}
+        func = entry["function"]
+        if func is None:
+            description["resolved"] = False
+            functions.append(description)
+            continue
+        description["resolved"] = True
         try:
-            func_path = task["function"]
-            args = task.get("args", [])
-            kwargs = task.get("kwargs", {})
+            description["signature"] = str(inspect.signature(func))
+            doc = inspect.getdoc(func)
+            description["doc"] = doc.splitlines()[0] if doc else None
+        except Exception as e:
+            description["error"] = str(e)
+        functions.append(description)
 
-            module_path, func_name = func_path.rsplit(".", 1)
-            module = __import__(module_path, fromlist=[func_name])
-            func = getattr(module, func_name)
+    return {"functions": functions, "hits": registry_stats["hits"], "misses": registry_stats["misses"]}
 
-            unreal.log(f"[Tick] Calling function: {func_path} with args={args}, kwargs={kwargs}")
-            result = func(*args, **kwargs)
 
-            # Store result to send back
-            task["__result__"] = result
+for exposed_function in EXPOSED_FUNCTIONS:
+    register_function(exposed_function, cache_ttl=CACHEABLE_FUNCTIONS.get(exposed_function),
+                      priority=FUNCTION_PRIORITIES.get(exposed_function),
+                      exclusive=exposed_function in EXCLUSIVE_FUNCTIONS)
+
+
+def get_call_key(call):
+    """
+    :param call: call dictionary
+    :return: key identifying the call for coalescing and caching, None if its function is not cacheable
+    """
+    entry = function_registry.get(call["function"])
+    if not entry or not entry["cache_ttl"]:
+        return None
+    return json.dumps([call["function"], call["args"], call["kwargs"]], sort_keys=True, default=str)
+
+
+def get_cached_result(call_key):
+    with cache_lock:
+        cached = result_cache.get(call_key)
+        if cached and cached[0] > time.time():
+            return True, cached[1]
+        result_cache.pop(call_key, None)
+    return False, None
+
+
+def clear_result_cache(*args):
+    """
+    Drops every cached result, hooked up to asset registry changes
+    """
+    global cache_generation
+    with cache_lock:
+        result_cache.clear()
+        cache_generation += 1
+
+
+asset_registry_events.add_listener(clear_result_cache)
+
+
+def set_tick_budget(budget_ms):
+    """
+    Sets how many milliseconds of bridge work may run per editor frame
+    :param budget_ms: budget in milliseconds, at least one step of work still runs each frame
+    :return: the budget now in use
+    """
+    global TICK_BUDGET_MS
+    TICK_BUDGET_MS = max(0.0, float(budget_ms))
+    return TICK_BUDGET_MS
+
+
+# Registered by object, this module runs as the editor startup script and must not be imported a second time
+register_function("unreal_tools.http_server.set_tick_budget", set_tick_budget, priority="interactive")
+
+def call_function(call):
+    """
+    Resolves and runs a single call from a request payload, must be run on the game thread
+    :param call: dictionary with "function" and optional "args" / "kwargs"
+    :return: whatever the called function returns, generators are returned unstarted
+    """
+    func_path = call["function"]
+    args = call.get("args", [])
+    kwargs = call.get("kwargs", {})
+
+    func = resolve_function(func_path)
+
+    unreal.log(f"[Tick] Calling function: {func_path} with args={args}, kwargs={kwargs}")
+    return func(*args, **kwargs)
+
+
+def call_batch(calls):
+    """
+    Runs batched calls back to back, a failing call is reported in its slot and does not stop the rest
+    :param calls: ordered list of call dictionaries
+    :return: list with {"result": ...} or {"error": ...} for each call, in request order
+    """
+    results = []
+    for call in calls:
+        if "error" in call:
+            # Rejected when the batch was built, ie the function is not exposed
+            results.append({"error": call["error"]})
+            continue
+        started = time.perf_counter()
+        try:
+            results.append({"result": run_steps(call_function(call))})
         except Exception as e:
             unreal.log_error(f"Function call failed: {e}")
-            task["__result__"] = {"error": str(e)}
+            results.append({"error": str(e)})
+        metrics.observe(call["function"], "execution", (time.perf_counter() - started) * 1000.0)
+    return results
+
+
+def notify_task(task, event, data):
+    """
+    Records a job event and wakes anything streaming the job's progress
+    :param task: task dictionary
+    :param event: event name, ie "progress", "finished", "failed", "cancelled"
+    :param data: json serializable event payload
+    """
+    with task["__changed__"]:
+        task["__events__"].append({"event": event, "data": data})
+        task["__changed__"].notify_all()
+
+
+def finish_task(task, result, status="finished"):
+    """
+    Stores the result and wakes the waiting request handler
+    """
+    task["__result__"] = result
+    task["__status__"] = status
+    task["__finished_at__"] = time.time()
+    if status == "failed":
+        metrics.increment("failed")
+    if task["__exec_ms__"] and "calls" not in task:
+        metrics.observe(task["function"], "execution", task["__exec_ms__"])
+    call_key = task.get("__call_key__")
+    if call_key:
+        with cache_lock:
+            if inflight_calls.get(call_key) is task:
+                inflight_calls.pop(call_key)
+            fresh = task["__cache_generation__"] == cache_generation
+            if fresh and status == "finished" and not (isinstance(result, dict) and "error" in result):
+                ttl = function_registry[task["function"]]["cache_ttl"]
+                result_cache[call_key] = (time.time() + ttl, result)
+    task["__done__"].set()
+    notify_task(task, status, result if status != "finished" else None)
+
+
+def start_task(task):
+    """
+    Runs a newly queued task. Plain functions finish here, generator functions are parked in running_tasks
+    :param task: task dictionary built by the request handler
+    """
+    if task["__status__"] == "cancelled":
+        return
+
+    task["__status__"] = "running"
+    task["__started_at__"] = time.time()
+    queue_wait_ms = (task["__started_at__"] - task["__queued_at__"]) * 1000.0
+    for call in task.get("calls", [task]):
+        if "error" not in call:
+            metrics.observe(call["function"], "queue_wait", queue_wait_ms)
+    try:
+        if "calls" in task:
+            # Batches run inside this same tick pass
+            finish_task(task, call_batch(task["calls"]))
+            return
+
+        started = time.perf_counter()
+        result = call_function(task)
+        task["__exec_ms__"] += (time.perf_counter() - started) * 1000.0
+        if isinstance(result, types.GeneratorType):
+            task["__steps__"] = result
+            running_tasks.append(task)
+            step_task(task)
+        else:
+            finish_task(task, result)
+    except Exception as e:
+        unreal.log_error(f"Function call failed: {e}")
+        finish_task(task, {"error": str(e)}, status="failed")
+
+
+def step_task(task):
+    """
+    Resumes a generator task for one step. Whatever the step yields is kept as the task's progress
+    :param task: task dictionary with a "__steps__" generator
+    """
+    started = time.perf_counter()
+    try:
+        try:
+            task["__progress__"] = next(task["__steps__"])
         finally:
-            task["__handled__"] = True
+            task["__exec_ms__"] += (time.perf_counter() - started) * 1000.0
+        task["__step_count__"] += 1
+        unreal.log(f"[Tick] {task['function']} (task {task['__id__']}) progress: {task['__progress__']}")
+        notify_task(task, "progress", task["__progress__"])
+    except StopIteration as stop:
+        running_tasks.remove(task)
+        finish_task(task, stop.value)
+    except Exception as e:
+        running_tasks.remove(task)
+        unreal.log_error(f"Function call failed: {e}")
+        finish_task(task, {"error": str(e)}, status="failed")
+
+
+def is_exclusive(task):
+    """
+    :param task: task dictionary, a single call or a batch
+    :return: True if any of its calls is to an exclusive function
+    """
+    for call in task.get("calls", [task]):
+        entry = function_registry.get(call.get("function"))
+        if entry and entry["exclusive"]:
+            return True
+    return False
+
+
+def can_start_task(task):
+    """
+    Queue filter for the tick. An exclusive task waits while another exclusive generator is still running
+    """
+    return not is_exclusive(task) or not any(is_exclusive(running) for running in running_tasks)
+
+
+def tick(delta_time):
+    """
+    Slate post tick callback. Starts queued tasks and resumes generator tasks until TICK_BUDGET_MS is used,
+    so long imports are spread across frames and the editor stays responsive
+    """
+    global resume_index
+    tick_started = time.perf_counter()
+    deadline = tick_started + TICK_BUDGET_MS / 1000.0
+    while True:
+        try:
+            # Never block the game thread, a cancel can empty the queue between a check and a get
+            queued_task = request_queue.get_nowait(can_start=can_start_task)
+        except queue.Empty:
+            queued_task = None
+
+        if queued_task:
+            start_task(queued_task)
+        elif running_tasks:
+            # Round robin so one long import does not starve the others
+            resume_index %= len(running_tasks)
+            step_task(running_tasks[resume_index])
+            resume_index += 1
+        else:
+            break
+
+        if time.perf_counter() >= deadline:
+            break
+
+    queue_catalogue_write()
+
+    metrics.set_queue_depth(request_queue.qsize(), len(running_tasks))
+    metrics.observe_tick((time.perf_counter() - tick_started) * 1000.0)
+
+
+def queue_catalogue_write():
+    """
+    Queues the project catalogue write as a bulk task once the registry has settled and the bridge is idle,
+    so building it runs a skeleton per step within the tick budget rather than stalling a frame
+    :return: the queued task, None if nothing was queued
+    """
+    global catalogue_task
+    if catalogue_task is not None and not catalogue_task["__done__"].is_set():
+        return None
+    if not project_catalogue.is_catalogue_due(busy=bool(running_tasks) or not request_queue.empty()):
+        return None
+
+    task = build_task({"function": "unreal_tools.project_catalogue.write_catalogue",
+                       "kwargs": {"cooperative": True}}, priority="bulk")
+    try:
+        request_queue.put_nowait(task)
+    except queue.Full:
+        return None
+    record_job(task)
+    catalogue_task = task
+    return task
+
+
+def get_task_progress():
+    """
+    Lists the generator tasks still being worked on across ticks
+    :return: list of dictionaries with id, function, steps run, last progress and seconds since queued
+    """
+    now = time.time()
+    return [{
+        "id": task["__id__"],
+        "function": task["function"],
+        "steps": task["__step_count__"],
+        "progress": task.get("__progress__"),
+        "elapsed": round(now - task["__queued_at__"], 3)
+    } for task in list(running_tasks)]
 
 unreal.register_slate_post_tick_callback(tick)
 
 
+def to_columnar(result):
+    """
+    Packs a list of records, or a dict of records, into one list of column names plus rows of values,
+    so keys repeated on every record are only sent once. Every record has to share the same keys.
+    :param result: function result to pack
+    :return: columnar dictionary, or None if the result is not made of records
+    """
+    if isinstance(result, dict):
+        keys = list(result.keys())
+        records = list(result.values())
+    elif isinstance(result, list):
+        keys = None
+        records = result
+    else:
+        return None
+
+    if not records or not all(isinstance(record, dict) for record in records):
+        return None
+    columns = list(records[0].keys())
+    if any(len(record) != len(columns) or any(column not in record for column in columns) for record in records):
+        return None
+
+    packed = {"__columnar__": 1, "columns": columns, "rows": [[record[column] for column in columns] for record in records]}
+    if keys is not None:
+        packed["keys"] = keys
+    return packed
+
+
+def encode_json(body, response_format):
+    """
+    :param body: json serializable response body
+    :param response_format: one of RESPONSE_FORMATS
+    :return: [encoded bytes, format actually used], columnar falls back to compact for results that aren't records
+    """
+    if response_format == "columnar":
+        packed = to_columnar(body)
+        if packed is None:
+            response_format = "compact"
+        else:
+            body = packed
+
+    if response_format == "pretty":
+        text = json.dumps(body, indent=2, default=str)
+    else:
+        text = json.dumps(body, separators=(',', ':'), default=str)
+    return [text.encode('utf-8'), response_format]
+
+
+class FunctionNotExposedError(LookupError):
+    """
+    Raised for calls to functions the bridge does not expose, answered with a 404 rather than a server error
+    """
+
+
+def build_call(data):
+    """
+    Validates one call from a request body and strips it down to what the tick handler needs
+    :param data: {"function": "module.func", "args": [], "kwargs": {}, "priority": optional lane name}
+    :raises FunctionNotExposedError: when the function is not registered
+    :return: call dictionary
+    """
+    if not isinstance(data, dict) or "function" not in data:
+        raise ValueError("Missing 'function' in request body")
+    if data["function"] not in function_registry:
+        raise FunctionNotExposedError(f"Function is not exposed through the bridge: {data['function']}")
+
+    return {
+        "function": data["function"],
+        "args": data.get("args", []),
+        "kwargs": data.get("kwargs", {}),
+        "priority": validate_priority(data.get("priority", function_registry[data["function"]]["priority"]))
+    }
+
+
+def build_batch_call(data):
+    """
+    build_call for one call of a batch. A call to a function the bridge does not expose is kept with its error,
+    so it fails in its own slot and the rest of the batch still runs
+    :param data: one entry of the request's JSON array
+    :return: call dictionary, with "error" instead of a priority when it was rejected
+    """
+    try:
+        return build_call(data)
+    except FunctionNotExposedError as e:
+        unreal.log_warning(f"Rejected batch call: {e}")
+        return {"function": data["function"], "error": str(e)}
+
+
+def build_task(data, priority=None):
+    """
+    Builds a task from a request body with placeholders for result, the tick handler sets __done__ once
+    __result__ is filled. A JSON array is a batch: every call runs back to back in one tick and one round-trip
+    :param data: decoded request body, a single call or a list of calls
+    :param priority: lane for the whole task, overrides the calls' own. A batch otherwise takes its most urgent call's
+    :return: task dictionary
+    """
+    if isinstance(data, list):
+        task = {"calls": [build_batch_call(call) for call in data], "function": f"batch of {len(data)} calls"}
+        call_priorities = [call["priority"] for call in task["calls"] if "priority" in call]
+    else:
+        task = build_call(data)
+        call_priorities = [task["priority"]]
+    if priority:
+        task["__priority__"] = validate_priority(priority)
+    else:
+        task["__priority__"] = min(call_priorities, key=PRIORITY_LANES.index, default=DEFAULT_PRIORITY)
+    task["__id__"] = next(task_ids)
+    task["__status__"] = "queued"
+    task["__queued_at__"] = time.time()
+    task["__started_at__"] = None
+    task["__finished_at__"] = None
+    task["__step_count__"] = 0
+    task["__exec_ms__"] = 0.0
+    task["__progress__"] = None
+    task["__result__"] = None
+    task["__done__"] = threading.Event()
+    # Callers waiting on this task, more than one once identical calls coalesce onto it
+    task["__callers__"] = 1
+    task["__events__"] = []
+    task["__changed__"] = threading.Condition()
+    return task
+
+
+def submit_task(task):
+    """
+    Queues a task for the tick handler and records it as a job.
+    Cacheable calls are answered from the cache, or attached to an identical call that is already in flight
+    :param task: task dictionary from build_task
+    :raises queue.Full: when the bridge is already holding MAX_QUEUED_REQUESTS
+    :return: the task that will carry the result, which may be an earlier identical one
+    """
+    metrics.increment("requests")
+    call_key = get_call_key(task) if "calls" not in task else None
+    if call_key:
+        found, result = get_cached_result(call_key)
+        if found:
+            metrics.increment("cache_hits")
+            task["__status__"] = "finished"
+            task["__result__"] = result
+            task["__finished_at__"] = time.time()
+            task["__done__"].set()
+            task["__events__"].append({"event": "finished", "data": None})
+            record_job(task)
+            return task
+
+        with cache_lock:
+            inflight = inflight_calls.get(call_key)
+            if inflight is None:
+                task["__call_key__"] = call_key
+                task["__cache_generation__"] = cache_generation
+                inflight_calls[call_key] = task
+            else:
+                inflight["__callers__"] += 1
+        if inflight is not None:
+            metrics.increment("coalesced")
+            # A more urgent caller should not wait at the priority of the call it joined
+            request_queue.promote(inflight, task["__priority__"])
+            return inflight
+
+    try:
+        request_queue.put_nowait(task)
+    except queue.Full:
+        metrics.increment("rejected")
+        if call_key:
+            with cache_lock:
+                inflight_calls.pop(call_key, None)
+        raise
+    metrics.set_queue_depth(request_queue.qsize())
+    record_job(task)
+    return task
+
+
+def record_job(task):
+    with jobs_lock:
+        jobs[task["__id__"]] = task
+        while len(jobs) > JOB_HISTORY:
+            oldest_id = next(iter(jobs))
+            if not jobs[oldest_id]["__done__"].is_set():
+                break
+            jobs.pop(oldest_id)
+
+
+def get_job(job_id):
+    with jobs_lock:
+        return jobs.get(job_id)
+
+
+def cancel_job(job_id):
+    """
+    Cancels a job that has not started yet, jobs already running on the game thread are left to finish.
+    A job other callers coalesced onto is shared with them and is not cancelled
+    :param job_id: id returned when the job was submitted
+    :return: True if the job was cancelled
+    """
+    task = get_job(job_id)
+    if not task or task["__status__"] != "queued":
+        return False
+    with cache_lock:
+        if task["__callers__"] > 1:
+            return False
+        # Nothing may coalesce onto a task that is about to be cancelled
+        call_key = task.get("__call_key__")
+        if call_key and inflight_calls.get(call_key) is task:
+            inflight_calls.pop(call_key)
+    # The tick may have taken the task between the status check and here, only a task still waiting is cancelled
+    if not request_queue.remove(task):
+        return False
+    finish_task(task, None, status="cancelled")
+    return True
+
+
+def estimate_execution_ms(task):
+    """
+    :return: milliseconds the task is expected to run, from the mean execution time recorded for its functions.
+        Functions that have not run yet this session count as 0
+    """
+    return sum(metrics.get_mean(call["function"], "execution") or 0.0 for call in task.get("calls", [task]))
+
+
+def get_queue_position(task):
+    """
+    :param task: task dictionary
+    :return: [1 based position in the queue, expected seconds until it starts], [None, None] if it is not queued
+    """
+    tasks_ahead = request_queue.get_tasks_ahead(task)
+    if tasks_ahead is None:
+        return [None, None]
+    expected_ms = sum(estimate_execution_ms(queued) for queued in tasks_ahead)
+    return [len(tasks_ahead) + 1, round(expected_ms / 1000.0, 3)]
+
+
+def describe_job(task, include_result=True):
+    """
+    :param task: task dictionary
+    :param include_result: adds the result once the job is done
+    :return: json friendly status of the job, with queue position and expected wait while it is queued
+    """
+    description = {
+        "id": task["__id__"],
+        "function": task["function"],
+        "status": task["__status__"],
+        "priority": task["__priority__"],
+        "progress": task["__progress__"],
+        "steps": task["__step_count__"],
+        "queued_at": task["__queued_at__"],
+        "started_at": task["__started_at__"],
+        "finished_at": task["__finished_at__"]
+    }
+    if task["__status__"] == "queued":
+        description["queue_position"], description["expected_wait"] = get_queue_position(task)
+    if include_result and task["__done__"].is_set():
+        description["result"] = task["__result__"]
+    return description
+
+
 class RequestHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so clients can keep one connection open across calls, every response sets Content-Length
+    protocol_version = "HTTP/1.1"
+    timeout = KEEP_ALIVE_TIMEOUT
+    # Headers and body go out in separate writes, without this the body waits on the client's delayed ack
+    disable_nagle_algorithm = True
+
     def log_message(self, format, *args):
         unreal.log(f"HTTP: {self.address_string()} - {format % args}")
 
-    def do_POST(self):
+    def send_json(self, status, body, headers=None, indent=None, task=None):
+        """
+        Sends a json body in the format the client asked for with X-Bridge-Format, gzipped if it accepts gzip.
+        The format and encoding used are echoed back in the X-Bridge-Format and Content-Encoding headers
+        :param task: task the body is the result of, its function is charged the serialization time
+        """
+        started = time.perf_counter()
+        response_format = self.headers.get('X-Bridge-Format', '').strip().lower()
+        if response_format not in RESPONSE_FORMATS:
+            response_format = "pretty" if indent else "compact"
+        payload, response_format = encode_json(body, response_format)
+
+        content_encoding = None
+        if 'gzip' in self.headers.get('Accept-Encoding', '') and len(payload) >= GZIP_MIN_BYTES:
+            payload = gzip.compress(payload, compresslevel=5)
+            content_encoding = 'gzip'
+
+        if task:
+            function = "batch" if "calls" in task else task["function"]
+            metrics.observe(function, "serialization", (time.perf_counter() - started) * 1000.0)
+
+        self.send_payload(status, payload, 'application/json', headers, response_format, content_encoding)
+
+    def send_payload(self, status, payload, content_type, headers=None, response_format=None, content_encoding=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        if response_format:
+            self.send_header('X-Bridge-Format', response_format)
+        if content_encoding:
+            self.send_header('Content-Encoding', content_encoding)
+        self.send_header('Content-Length', str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def send_queue_full(self, task):
+        unreal.log_warning(f"Request queue full, rejecting {task['function']}")
+        self.send_json(503, {"error": "Request queue is full, retry later"},
+                       headers={'Retry-After': str(RETRY_AFTER_SECONDS)})
+
+    def read_json_body(self):
         content_length = int(self.headers['Content-Length'])
         post_data = self.rfile.read(content_length)
+        return json.loads(post_data.decode('utf-8'))
+
+    def find_job(self, job_id):
+        try:
+            task = get_job(int(job_id))
+        except ValueError:
+            task = None
+        if not task:
+            self.send_json(404, {"error": f"Unknown job: {job_id}"})
+        return task
+
+    def do_GET(self):
+        parts = [part for part in self.path.split('?')[0].split('/') if part]
+        if parts == ['ping']:
+            # Answered on the HTTP thread, so clients can tell the editor is up without waiting on a tick
+            self.send_json(200, {"alive": True, "queue_depth": request_queue.qsize()})
+        elif parts == ['tasks']:
+            self.send_json(200, get_task_progress(), indent=2)
+        elif parts == ['functions']:
+            self.send_json(200, describe_functions(), indent=2)
+        elif parts == ['metrics']:
+            self.send_payload(200, metrics.to_prometheus().encode('utf-8'), 'text/plain; version=0.0.4')
+        elif parts == ['metrics.json']:
+            self.send_json(200, metrics.to_dict(), indent=2)
+        elif parts == ['jobs']:
+            with jobs_lock:
+                job_list = list(jobs.values())
+            self.send_json(200, [describe_job(task, include_result=False) for task in job_list], indent=2)
+        elif len(parts) == 2 and parts[0] == 'jobs':
+            task = self.find_job(parts[1])
+            if task:
+                self.send_json(200, describe_job(task), indent=2)
+        elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'result':
+            task = self.find_job(parts[1])
+            if task:
+                if task["__done__"].is_set():
+                    self.send_json(200, task["__result__"], indent=2, task=task)
+                else:
+                    self.send_json(409, {"error": f"Job {task['__id__']} is {task['__status__']}"})
+        elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'events':
+            task = self.find_job(parts[1])
+            if task:
+                self.stream_job_events(task)
+        else:
+            self.send_json(404, {"error": f"Unknown path: {self.path}"})
+
+    def stream_job_events(self, task):
+        """
+        Streams a job's progress as server-sent events until it finishes, fails or is cancelled.
+        Events already recorded are replayed first, so a client that reconnects does not miss any.
+        """
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        # The stream has no length, it ends when the server closes the connection
+        self.send_header('Connection', 'close')
+        self.end_headers()
+
+        sent = 0
         try:
-            data = json.loads(post_data.decode('utf-8'))
+            while True:
+                with task["__changed__"]:
+                    if sent == len(task["__events__"]) and not task["__done__"].is_set():
+                        task["__changed__"].wait(EVENT_STREAM_HEARTBEAT)
+                    pending = task["__events__"][sent:]
+                    done = task["__done__"].is_set()
+                sent += len(pending)
+
+                if not pending and not done:
+                    self.wfile.write(b": keep-alive\n\n")
+                for event in pending:
+                    message = f"event: {event['event']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+                    self.wfile.write(message.encode('utf-8'))
+                self.wfile.flush()
 
-            if "function" not in data:
-                raise ValueError("Missing 'function' in request body")
+                if done and sent == len(task["__events__"]):
+                    break
+        except (BrokenPipeError, ConnectionResetError):
+            # Client went away, the job keeps running and can be polled again by id
+            pass
 
-            # Build task with placeholders for result
-            task = {
-                "function": data["function"],
-                "args": data.get("args", []),
-                "kwargs": data.get("kwargs", {}),
-                "__result__": None,
-                "__handled__": False
-            }
+    def do_DELETE(self):
+        parts = [part for part in self.path.split('?')[0].split('/') if part]
+        if len(parts) == 2 and parts[0] == 'jobs':
+            task = self.find_job(parts[1])
+            if task:
+                if cancel_job(task["__id__"]):
+                    self.send_json(200, describe_job(task))
+                elif task["__callers__"] > 1 and task["__status__"] == "queued":
+                    self.send_json(409, {"error": f"Job {task['__id__']} is shared with {task['__callers__'] - 1} "
+                                                  f"other caller(s) and can't be cancelled"})
+                else:
+                    self.send_json(409, {"error": f"Job {task['__id__']} is {task['__status__']} and can't be cancelled"})
+        else:
+            self.send_json(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        try:
+            data = self.read_json_body()
+            task = build_task(data, self.headers.get('X-Bridge-Priority'))
 
-            # Queue it
-            request_queue.put(task)
+            # Queue it, or push back on the client rather than holding the connection open
+            try:
+                task = submit_task(task)
+            except queue.Full:
+                self.send_queue_full(task)
+                return
 
-            # Wait for Unreal tick to process it
-            while not task["__handled__"]:
-                time.sleep(0.05)
+            if self.path.rstrip('/') == '/jobs':
+                # Asynchronous submit: answer with the job id straight away
+                self.send_json(202, describe_job(task, include_result=False), indent=2)
+                return
+
+            # Block until the Unreal tick has processed it
+            task["__done__"].wait()
 
             # Send back result
-            result = task["__result__"]
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps(result, indent=2, default=str).encode('utf-8'))
+            self.send_json(200, task["__result__"], indent=2, task=task)
 
+        except FunctionNotExposedError as e:
+            unreal.log_warning(f"Rejected request: {e}")
+            self.send_json(404, {"error": str(e)})
+        except InvalidPriorityError as e:
+            unreal.log_warning(f"Rejected request: {e}")
+            self.send_json(400, {"error": str(e), "priorities": list(PRIORITY_LANES)})
         except Exception as e:
             unreal.log_error(f"Error handling request: {e}")
-            self.send_response(500)
-            self.end_headers()
-            self.wfile.write(json.dumps({"error": str(e)}).encode('utf-8'))
+            self.send_json(500, {"error": str(e)})
+
+
+class BridgeHTTPServer(ThreadingHTTPServer):
+    """
+    Threaded server so a long import does not block cheap queries from other clients.
+    The listen backlog is raised so bursts of connections are accepted instead of reset.
+    """
+    daemon_threads = True
+    request_queue_size = 128
 
 
 def is_port_in_use(port):
@@ -109,12 +921,13 @@ def run_server():
         unreal.log_error(f"Port {port} already in use — HTTP server won't start.")
         return
     server_address = ('127.0.0.1', port)
-    httpd = HTTPServer(server_address, RequestHandler)
+    httpd = BridgeHTTPServer(server_address, RequestHandler)
     unreal.log(f"HTTP Server started on port {port}")
     httpd.serve_forever()
 
 
 def start_http_server_in_thread():
+    asset_registry_events.bind_asset_registry_events()
     server_thread = threading.Thread(target=run_server, daemon=True)
     server_thread.start()
 
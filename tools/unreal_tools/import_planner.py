@@ -0,0 +1,222 @@
+import os
+import json
+import collections
+from unreal_tools import unreal_project_data
+from utilities.json_data import write_json_atomic
+
+# Bumped when the plan layout changes, the executor refuses plans it doesn't understand
+IMPORT_PLAN_VERSION = 1
+# Rough editor seconds per operation, and per MB of FBX for the operations that read one. Only meant to tell a
+# five minute build from a two hour one, compare against a real run and adjust
+OPERATION_SECONDS = {
+    "create_sequence": 0.5,
+    "create_shot": 0.5,
+    "import_animation": 1.5,
+    "bind_camera": 1.0,
+    "bind_actor": 1.5,
+    "key_control_rig": 3.0,
+    "save_shot": 0.3,
+}
+FBX_SECONDS_PER_MB = {
+    "import_animation": 0.5,
+    "bind_camera": 0.2,
+    "key_control_rig": 2.0,
+}
+
+
+def get_content_file(content_dir, package_path):
+    """
+    :param content_dir: the project's Content folder
+    :param package_path: /Game/ package path
+    :return: the .uasset file the package is saved to
+    """
+    relative_path = package_path.split("/Game/", 1)[-1]
+    return os.path.join(content_dir, *relative_path.split("/")) + ".uasset"
+
+
+def get_operation_cost(op, fbx_path=None):
+    """
+    :return: estimated editor seconds for an operation, from OPERATION_SECONDS and the FBX size
+    """
+    seconds = OPERATION_SECONDS.get(op, 0.0)
+    if fbx_path and op in FBX_SECONDS_PER_MB:
+        try:
+            seconds += os.path.getsize(fbx_path) / (1024.0 * 1024.0) * FBX_SECONDS_PER_MB[op]
+        except OSError:
+            pass
+    return round(seconds, 2)
+
+
+def resolve_blueprint(skeleton_info, mesh_string):
+    """
+    Picks a blueprint the way sequence_importer does, the first one using a skeletal mesh named after the
+    character, otherwise the first one using the skeleton at all
+    :param skeleton_info: the skeleton's catalogue entry
+    :param mesh_string: character name from the row's namespace
+    :return: blueprint package path, None if no blueprint uses the skeleton
+    """
+    for mesh_path, blueprints in skeleton_info.get("mesh_blueprints", {}).items():
+        if mesh_string and mesh_string in mesh_path and blueprints:
+            return blueprints[0]
+    blueprints = skeleton_info.get("blueprints", [])
+    return blueprints[0] if blueprints else None
+
+
+def compile_import_plan(sequence_dict, sequence_name, catalogue, destination_path="/Game/Cinematics",
+                        content_dir=None):
+    """
+    Works out what create_cinematic_sequence_from_json would do with a sequence dictionary, without Unreal.
+    Skeletons and blueprints are resolved against the project catalogue and existing assets against the
+    project's Content folder. The resolved dictionary is kept in the plan, so the editor builds exactly what
+    was planned through sequence_importer.iter_import_plan
+
+    :param sequence_dict: shot dictionary from generate_sequence_dict_from_anim_dict
+    :param sequence_name: name of master sequence
+    :param catalogue: from unreal_project_data.read_project_catalogue, None resolves nothing
+    :param destination_path: content folder the sequence is built in
+    :param content_dir: (Optional) the project's Content folder, existing assets are not looked for without it
+    :return: plan dictionary with the ordered "operations", "problems" and "estimated_seconds"
+    """
+    skeletons = catalogue.get("skeletons", {}) if catalogue else {}
+    sequence_dir = f"{destination_path.rstrip('/')}/{sequence_name}"
+    problems = []
+    operations = []
+    if not catalogue:
+        problems.append("No project catalogue, skeletons and blueprints could not be resolved")
+
+    def asset_exists(package_path):
+        return bool(content_dir) and os.path.exists(get_content_file(content_dir, package_path))
+
+    def add_operation(op, shot=None, fbx_path=None, **kwargs):
+        operation = collections.OrderedDict(op=op, shot=shot)
+        operation.update(kwargs)
+        if fbx_path:
+            operation["fbx_path"] = fbx_path
+        operation["cost"] = get_operation_cost(op, fbx_path)
+        operations.append(operation)
+        return operation
+
+    sequence_path = f"{sequence_dir}/{sequence_name}"
+    add_operation("create_sequence", path=sequence_path, exists=asset_exists(sequence_path))
+
+    # Every animation is imported up front, before any shot is built, the same as iter_cinematic_sequence
+    resolved_dict = collections.OrderedDict()
+    shot_operations = []
+    imported = set()
+    for shot_name, animations in sequence_dict.items():
+        shot_sequence_dir = f"{sequence_dir}/_{shot_name}"
+        shot_sequence_path = f"{shot_sequence_dir}/_{shot_name}"
+        first = animations[0] if animations else {}
+        shot_operations.append(dict(op="create_shot", shot=shot_name, path=shot_sequence_path,
+                                    exists=asset_exists(shot_sequence_path),
+                                    range=[first.get("start_frame"), first.get("end_frame")], fps=first.get("fps")))
+        resolved_animations = []
+        for animation in animations:
+            animation = dict(animation)
+            resolved_animations.append(animation)
+            export_path = animation["export_path"]
+            namespace = animation["name_space"]
+            if not os.path.exists(export_path):
+                problems.append(f"{shot_name}: FBX file not found {export_path}")
+
+            if namespace == "CAM":
+                shot_operations.append(dict(op="bind_camera", shot=shot_name, fbx_path=export_path,
+                                            camera=(animation.get("nodes") or [None])[0]))
+                continue
+
+            skeleton_info = skeletons.get(animation["skeleton"])
+            if catalogue and not skeleton_info:
+                problems.append(f"{shot_name}: skeleton {animation['skeleton']} is not in the project")
+            skeleton_info = skeleton_info or {}
+            animation["skeleton_path"] = skeleton_info.get("path")
+            if not animation.get("blueprint"):
+                animation["blueprint"] = resolve_blueprint(skeleton_info, namespace.split("_")[0])
+            skeletal_meshes = skeleton_info.get("skeletal_meshes", [])
+            if skeleton_info and not animation["blueprint"] and not skeletal_meshes:
+                problems.append(f"{shot_name}: no blueprint or skeletal mesh uses skeleton {animation['skeleton']}")
+
+            if "FacialSliders" in export_path:
+                if skeleton_info and not animation["blueprint"]:
+                    problems.append(f"{shot_name}: facial sliders for {namespace} need a blueprint with a face rig")
+                shot_operations.append(dict(op="key_control_rig", shot=shot_name, fbx_path=export_path,
+                                            namespace=namespace, blueprint=animation["blueprint"]))
+                continue
+
+            root, ext = os.path.splitext(export_path)
+            animation_name = os.path.basename(export_path.replace(ext, ""))
+            animation_path = f"{shot_sequence_dir}/{animation_name}"
+            if export_path not in imported:
+                imported.add(export_path)
+                add_operation("import_animation", shot=shot_name, fbx_path=export_path,
+                              skeleton_path=animation["skeleton_path"], destination_path=shot_sequence_dir,
+                              destination_name=animation_name, asset_path=animation_path,
+                              exists=asset_exists(animation_path))
+            shot_operations.append(dict(op="bind_actor", shot=shot_name, namespace=namespace,
+                                        blueprint=animation["blueprint"],
+                                        skeletal_mesh=None if animation["blueprint"] else
+                                        (skeletal_meshes[0] if skeletal_meshes else None),
+                                        animation_path=animation_path))
+        shot_operations.append(dict(op="save_shot", shot=shot_name, path=shot_sequence_path))
+        resolved_dict[shot_name] = resolved_animations
+
+    for operation in shot_operations:
+        add_operation(**operation)
+
+    return {
+        "version": IMPORT_PLAN_VERSION,
+        "sequence_name": sequence_name,
+        "destination_path": destination_path,
+        "sequence_path": sequence_path,
+        "catalogue_stamp": catalogue.get("stamp") if catalogue else None,
+        "operations": operations,
+        "problems": problems,
+        "estimated_seconds": round(sum(operation["cost"] for operation in operations), 2),
+        "shots": resolved_dict
+    }
+
+
+def compile_import_plan_from_json(anim_dict_path, uproject_path, destination_path="/Game/Cinematics"):
+    """
+    Dry run of create_cinematic_sequence_from_json for an exported json, using the catalogue next to the uproject
+    :param anim_dict_path: Path to the JSON file containing animation data, generated from maya export
+    :param uproject_path: actual uproject path
+    :param destination_path: same destination the sequence would be created in
+    :return: plan dictionary, see compile_import_plan
+    """
+    with open(anim_dict_path, "r") as f:
+        sequence_dict = json.load(f, object_pairs_hook=collections.OrderedDict)
+    sequence_name = os.path.basename(anim_dict_path).split('.')[0]
+    catalogue = unreal_project_data.read_project_catalogue(uproject_path)
+    content_dir = os.path.join(os.path.dirname(uproject_path), "Content")
+    return compile_import_plan(sequence_dict, sequence_name, catalogue, destination_path=destination_path,
+                               content_dir=content_dir)
+
+
+def get_plan_summary(plan):
+    """
+    :return: {"operations": {op: count}, "estimated_seconds", "problems"} for showing a plan before running it
+    """
+    counts = collections.OrderedDict()
+    for operation in plan["operations"]:
+        counts[operation["op"]] = counts.get(operation["op"], 0) + 1
+    return {"operations": counts, "estimated_seconds": plan["estimated_seconds"], "problems": plan["problems"]}
+
+
+def write_import_plan(plan, plan_path):
+    """
+    Writes a plan for sequence_importer.run_import_plan_from_json, swapped in so the editor never reads half of it
+    :return: plan_path
+    """
+    return write_json_atomic(plan, plan_path, indent=4)
+
+
+def read_import_plan(plan_path):
+    """
+    :return: the plan written by write_import_plan
+    :raises ValueError: when the plan was written by a different version of the planner
+    """
+    with open(plan_path, "r") as f:
+        plan = json.load(f, object_pairs_hook=collections.OrderedDict)
+    if plan.get("version") != IMPORT_PLAN_VERSION:
+        raise ValueError(f"Import plan version {plan.get('version')} is not supported, compile it again: {plan_path}")
+    return plan
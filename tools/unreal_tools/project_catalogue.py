@@ -0,0 +1,141 @@
+import unreal
+import os
+import time
+from unreal_tools import asset_registry_events, unreal_project_data
+from unreal_tools.commandlet_job import run_steps
+from unreal_tools.asset_index import skeleton_index
+from utilities.json_data import write_json_atomic
+
+# Content root the catalogue lists, the same one the skeleton queries search
+CATALOGUE_ROOT = "/Game/"
+# Seconds without further asset changes before the catalogue is written again, so a batch import writes it once
+CATALOGUE_DEBOUNCE_SECONDS = 5.0
+
+# Identifies this editor session in the stamp, the registry change counter starts over every session
+session_id = f"{os.getpid()}-{int(time.time())}"
+catalogue_state = {"dirty_since": 0.0, "written_counter": None}
+
+
+def get_uproject_path():
+    """
+    :return: full path of the open project's .uproject
+    """
+    return unreal.Paths.convert_relative_path_to_full(unreal.Paths.get_project_file_path())
+
+
+def get_assets_of_class(package, class_name):
+    """
+    Reads asset data only, nothing is loaded
+    :return: list of [asset name, package path] under CATALOGUE_ROOT
+    """
+    asset_registry = unreal.AssetRegistryHelpers.get_asset_registry()
+    class_path = unreal.TopLevelAssetPath(package, class_name)
+    assets = []
+    for asset_data in asset_registry.get_assets_by_class(class_path, True):
+        package_name = str(asset_data.package_name)
+        if package_name.startswith(CATALOGUE_ROOT):
+            assets.append([str(asset_data.asset_name), package_name])
+    return assets
+
+
+def build_catalogue():
+    """
+    Collects what the DCC tools need to know about the project: skeletons with the skeletal meshes and blueprints
+    using them, and the control rigs
+    :return: catalogue dictionary, see unreal_project_data.read_project_catalogue
+    """
+    return run_steps(iter_build_catalogue())
+
+
+def iter_build_catalogue():
+    """
+    Step generator version of build_catalogue, yields after every skeleton so the bridge tick can spread the
+    referencer queries across frames
+    :return: catalogue dictionary, once exhausted
+    """
+    change_counter = asset_registry_events.get_change_counter()
+    skeletons = {}
+    skeleton_assets = get_assets_of_class("/Script/Engine", "Skeleton")
+    yield {"stage": "catalogue", "completed_skeletons": 0, "total_skeletons": len(skeleton_assets)}
+    for skeleton_name, skeleton_path in skeleton_assets:
+        skeletal_meshes = skeleton_index.get_skeletal_meshes(skeleton_path)
+        skeletons[skeleton_name] = {
+            "class_name": "Skeleton",
+            "path": skeleton_path,
+            "skeletal_meshes": skeletal_meshes,
+            "blueprints": skeleton_index.get_blueprints(skeleton_path),
+            "mesh_blueprints": {mesh_path: skeleton_index.get_mesh_blueprints(mesh_path) for mesh_path in skeletal_meshes}
+        }
+        yield {"stage": "catalogue", "completed_skeletons": len(skeletons), "total_skeletons": len(skeleton_assets)}
+
+    control_rigs = dict(get_assets_of_class("/Script/ControlRigDeveloper", "ControlRigBlueprint"))
+    return {
+        "version": unreal_project_data.CATALOGUE_VERSION,
+        "stamp": f"{session_id}:{change_counter}",
+        "change_counter": change_counter,
+        "generated_at": time.time(),
+        "skeletons": skeletons,
+        "control_rigs": control_rigs
+    }
+
+
+def write_catalogue(uproject_path=None, cooperative=False):
+    """
+    Writes the catalogue next to the .uproject. Written to a temp file and swapped in, so a DCC never reads half of it
+    :param uproject_path: defaults to the open project
+    :param cooperative: returns the step generator instead of running it, so the bridge can spread it across ticks
+    :return: the catalogue path
+    """
+    steps = iter_write_catalogue(uproject_path)
+    if cooperative:
+        return steps
+    return run_steps(steps)
+
+
+def iter_write_catalogue(uproject_path=None):
+    """
+    Step generator version of write_catalogue. A failed write is only retried after the next asset change
+    :return: the catalogue path, once exhausted
+    """
+    uproject_path = uproject_path or get_uproject_path()
+    catalogue_path = unreal_project_data.get_catalogue_path(uproject_path)
+    try:
+        catalogue = yield from iter_build_catalogue()
+        write_json_atomic(catalogue, catalogue_path, indent=4)
+    except Exception as e:
+        catalogue_state["written_counter"] = asset_registry_events.get_change_counter()
+        unreal.log_error(f"Could not write the project catalogue: {e}")
+        raise
+
+    catalogue_state["written_counter"] = catalogue["change_counter"]
+    catalogue_state["dirty_since"] = 0.0
+    unreal.log(f"Wrote project catalogue with {len(catalogue['skeletons'])} skeletons to {catalogue_path}")
+    return catalogue_path
+
+
+def on_asset_change(change_type, asset_data, old_object_path):
+    # Every change pushes the write back, so it happens once the changes stop
+    catalogue_state["dirty_since"] = time.time()
+
+
+def is_catalogue_due(busy=False):
+    """
+    Called from the bridge tick, which queues write_catalogue as a bulk task once the registry has settled
+    after a change
+    :param busy: True while bridge tasks are running, the write waits for them
+    :return: True if the catalogue should be written again
+    """
+    if busy:
+        return False
+    if catalogue_state["written_counter"] == asset_registry_events.get_change_counter():
+        return False
+    if catalogue_state["dirty_since"] and time.time() - catalogue_state["dirty_since"] < CATALOGUE_DEBOUNCE_SECONDS:
+        return False
+
+    asset_registry = unreal.AssetRegistryHelpers.get_asset_registry()
+    if hasattr(asset_registry, "is_loading_assets") and asset_registry.is_loading_assets():
+        return False
+    return True
+
+
+asset_registry_events.add_listener(on_asset_change)
@@ -0,0 +1,94 @@
+import unreal
+import os
+
+# Shots built between checkpoint flushes of a sequence build, 0 only saves when the build ends
+SAVE_CHECKPOINT_SHOTS = int(os.environ.get("TEW_SAVE_CHECKPOINT_SHOTS", 10))
+
+active_sessions = []
+
+
+def get_active_session():
+    """
+    Bridge tasks interleaved across ticks can hand work to each other's session, nothing is lost since every
+    session flushes what it was given when it closes
+    :return: the innermost open SaveSession, None when saves should happen right away
+    """
+    return active_sessions[-1] if active_sessions else None
+
+
+class SaveSession(object):
+    """
+    Defers asset saves and registry scans while a sequence or a batch of animations is built. Assets are only
+    recorded as touched, then written with one bulk save of the dirty ones when the session closes or reaches a
+    checkpoint. Each touched folder is scanned once, just before its first flush
+    """
+    def __init__(self, checkpoint_every=SAVE_CHECKPOINT_SHOTS):
+        self.checkpoint_every = checkpoint_every
+        self.steps_since_flush = 0
+        self.touched_assets = {}
+        self.touched_paths = {}
+        self.scanned_paths = set()
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def open(self):
+        active_sessions.append(self)
+        return self
+
+    def close(self):
+        """
+        Stops deferring and flushes whatever is still pending
+        """
+        if self in active_sessions:
+            active_sessions.remove(self)
+        self.flush()
+
+    def add(self, asset_directory, asset_path):
+        """
+        Records an asset to save and the folder to scan for it, see update_asset_registry_and_save
+        """
+        if asset_directory not in self.scanned_paths:
+            self.touched_paths[asset_directory] = True
+        if asset_path:
+            self.touched_assets[asset_path] = True
+
+    def checkpoint(self):
+        """
+        Called after each shot, flushes every checkpoint_every shots so a crash loses at most that many
+        :return: True if it flushed
+        """
+        self.steps_since_flush += 1
+        if self.checkpoint_every and self.steps_since_flush >= self.checkpoint_every:
+            self.flush()
+            return True
+        return False
+
+    def flush(self):
+        """
+        Scans the folders touched for the first time in one call, then saves the touched assets that are dirty
+        """
+        self.steps_since_flush = 0
+        if self.touched_paths:
+            asset_registry = unreal.AssetRegistryHelpers.get_asset_registry()
+            asset_registry.scan_paths_synchronous(list(self.touched_paths))
+            self.scanned_paths.update(self.touched_paths)
+            self.touched_paths = {}
+
+        if not self.touched_assets:
+            return
+        assets = []
+        for asset_path in self.touched_assets:
+            asset = unreal.EditorAssetLibrary.load_asset(asset_path)
+            if asset:
+                assets.append(asset)
+            else:
+                unreal.log_warning(f"Could not save {asset_path}, it no longer exists")
+        self.touched_assets = {}
+
+        if assets and not unreal.EditorAssetLibrary.save_loaded_assets(assets, only_if_is_dirty=True):
+            unreal.log_error(f"Some of the {len(assets)} touched assets failed to save")
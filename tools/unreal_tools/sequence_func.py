@@ -1,7 +1,6 @@
 import unreal
 import sys
 import os
-import json
 
 
 def create_cinematic_sequence_from_json(anim_dict_path, destination_path="/Game/Cinematics"):
@@ -19,21 +18,21 @@ def create_cinematic_sequence_from_json(anim_dict_path, destination_path="/Game/
     tools_dir = os.path.dirname(script_dir)
     sys.path.append(tools_dir)
 
-    from unreal_tools import sequence_importer
-    sequence_path = sequence_importer.create_cinematic_sequence_from_json(anim_dict_path, destination_path=destination_path)
+    from unreal_tools import sequence_importer, commandlet_job, fbx_batch_import
+    steps = sequence_importer.create_cinematic_sequence_from_json(anim_dict_path, destination_path=destination_path,
+                                                                  cooperative=True,
+                                                                  import_batch_size=fbx_batch_import.IMPORT_BATCH_SIZE)
+    sequence_path = commandlet_job.run_steps(steps, on_step=commandlet_job.log_progress) if steps is not None else None
     unreal.log(f"Created Sequence at: {sequence_path}")
     return sequence_path
 
 
-if __name__ == "__main__":
-    script_dir = os.path.dirname(__file__)
-    args_path = "C:/temp/sequence_args.json"
-
-    if not os.path.exists(args_path):
-        raise ValueError("Missing sequence_args.json")
-
-    with open(args_path, "r") as f:
-        args = json.load(f)
+def main():
+    """
+    Commandlet entry point, reads the job spec written by unreal_subprocess
+    :return: path to the created sequence
+    """
+    args = commandlet_job.read_job_spec()
 
     anim_dict_path = args.get("anim_dict_path")
     destination_path = args.get("destination_path")
@@ -44,5 +43,12 @@ if __name__ == "__main__":
     unreal.log(f"Parsed anim_dict_path: {anim_dict_path}")
     unreal.log(f"Parsed destination_path: {destination_path}")
 
-    create_cinematic_sequence_from_json(anim_dict_path, destination_path)
+    return create_cinematic_sequence_from_json(anim_dict_path, destination_path)
+
+
+if __name__ == "__main__":
+    sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+    from unreal_tools import commandlet_job
+
+    commandlet_job.run_job(main)
 
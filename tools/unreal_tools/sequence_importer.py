@@ -1,6 +1,15 @@
 import json
 import os
 import unreal
+from unreal_tools import asset_registry_events
+from unreal_tools.commandlet_job import run_steps
+from unreal_tools.asset_index import asset_index, skeleton_index
+from unreal_tools.fbx_batch_import import FbxBatchImporter, IMPORT_BATCH_SIZE, build_import_options, \
+    get_import_batch_size
+from unreal_tools.import_planner import read_import_plan
+from unreal_tools.save_session import SaveSession, get_active_session
+from unreal_tools.sequence_reconciler import diff_shot, get_row_key, plan_shot, read_shot_sections, \
+    remove_shot_rows, write_shot_state
 
 script_dir = os.path.dirname(__file__)
 tools_dir = os.path.dirname(script_dir)
@@ -451,10 +460,11 @@ def get_control_rig_class(control_rig_path = "Face_ControlBoard_CtrlRig"):
     :param control_rig_path:
     :return:
     """
-    control_rig_path = find_uasset_path(control_rig_path)
-    control_rig_asset = unreal.load_asset(control_rig_path)
+    control_rig_asset_path = find_uasset_path(control_rig_path)
+    control_rig_asset = unreal.load_asset(control_rig_asset_path) if control_rig_asset_path else None
     if not control_rig_asset:
         unreal.log_error(f"Failed to load Control Rig from {control_rig_path}")
+        return None
     control_rig_class = control_rig_asset.generated_class()
     return control_rig_class
 
@@ -546,88 +556,29 @@ def get_skeleton_from_skeletal_mesh_using_metadata(skeletal_mesh_path):
 def find_skeletal_meshes_using_skeleton(skeleton_asset_path):
     """
     Finds all Skeletal Mesh assets that use the given Skeleton asset.
+    Matches come from the session's skeleton index, only the meshes returned are loaded.
     :param skeleton_asset_path: The full asset path to the Skeleton (e.g. "/Game/Characters/Hero/Hero_Skeleton")
     :return: A list of SkeletalMesh asset objects that use the given Skeleton.
     """
     skeletal_meshes_using_skeleton = []
+    for skeletal_mesh_path in skeleton_index.get_skeletal_meshes(skeleton_asset_path):
+        skeletal_mesh = unreal.EditorAssetLibrary.load_asset(skeletal_mesh_path)
+        if skeletal_mesh:
+            skeletal_meshes_using_skeleton.append(skeletal_mesh)
 
-    skeleton = unreal.EditorAssetLibrary.load_asset(skeleton_asset_path)
-    if not skeleton:
-        unreal.log_error(f"Could not load skeleton at {skeleton_asset_path}")
-        return skeletal_meshes_using_skeleton
-
-    registry = unreal.AssetRegistryHelpers.get_asset_registry()
-
-    skeletal_mesh_class_path = unreal.TopLevelAssetPath("/Script/Engine", "SkeletalMesh")
-    skeletal_mesh_assets = registry.get_assets_by_class(skeletal_mesh_class_path, True)
-
-    for asset_data in skeletal_mesh_assets:
-        asset = unreal.EditorAssetLibrary.load_asset(asset_data.package_name)
-        skel = asset.get_editor_property('skeleton')
-        if skel:
-            package_name = skel.get_path_name().split('.')[0]
-            if package_name == skeleton_asset_path:
-                skeletal_mesh = unreal.EditorAssetLibrary.load_asset(asset_data.get_asset().get_path_name())
-                skeletal_meshes_using_skeleton.append(skeletal_mesh)
-
+    if not skeletal_meshes_using_skeleton:
+        unreal.log_error(f"No skeletal meshes found using skeleton {skeleton_asset_path}")
     return skeletal_meshes_using_skeleton
 
 
 def get_blueprints_using_skeleton_cmd(skeleton_path, asset_registry=None):
     """
-    Finds all Blueprints using a given skeleton, prioritizing CinematicCharacter Blueprints,
-    and only checks for CinematicCharacter, Actor, and Character Blueprints.
+    Finds all Blueprints using a given skeleton through one of their skeletal meshes.
     :param skeleton_path: The asset path of the skeleton (e.g., "/Game/Characters/Hero/Hero_Skeleton")
-    :return: A list of Blueprint asset paths, prioritizing CinematicCharacter BPs.
-    """
-    if not asset_registry:
-        asset_registry = unreal.AssetRegistryHelpers.get_asset_registry()
-
-    if not asset_registry:
-        unreal.log_error("Asset registry could not be initialized.")
-        return []
-
-    blueprint_class_path = unreal.TopLevelAssetPath("/Script/Engine.Blueprint")
-    blueprint_assets = asset_registry.get_assets_by_class(blueprint_class_path)
-
-    if not blueprint_assets:
-        unreal.log_error("No Blueprints found.")
-        return []
-
-    unreal.log(f"Found {len(blueprint_assets)} Blueprints.")
-
-    cinematic_bps = []
-
-    dependency_options = unreal.AssetRegistryDependencyOptions(
-        include_soft_package_references=True,
-        include_hard_package_references=True,
-        include_searchable_names=True,
-        include_soft_management_references=False,
-        include_hard_management_references=False
-    )
-
-    for blueprint in blueprint_assets:
-        if "Engine" or "Maps" not in blueprint.package_name :
-            unreal.log(f"Processing Blueprint: {blueprint.package_name}")
-            dependencies = asset_registry.get_dependencies(blueprint.package_name, dependency_options)
-            if dependencies:
-                for dep in dependencies:
-                    if 'Script' not in str(dep):
-                        dep_asset_data = unreal.EditorAssetLibrary.find_asset_data(dep)
-                        if dep_asset_data:
-                            test = dep_asset_data.get_asset()
-
-                            if isinstance(test, unreal.SkeletalMesh):
-                                asset = unreal.EditorAssetLibrary.load_asset(dep_asset_data.package_name)
-                                if not asset:
-                                    unreal.log_error(f"Failed to load asset: {dep_asset_data.package_name}")
-                                    continue
-
-                                skel = asset.get_editor_property('skeleton')
-                                if skel:
-                                    package_name = skel.get_path_name().split('.')[0]
-                                    if package_name == skeleton_path:
-                                        cinematic_bps.append(blueprint.get_asset())
+    :param asset_registry: unused, the session's skeleton index reads the registry
+    :return: A list of Blueprint assets, only these are loaded.
+    """
+    cinematic_bps = get_blueprints_using_skeleton(skeleton_path)
 
     unreal.log(f"Found {len(cinematic_bps)} Cinematic Blueprints.")
     return cinematic_bps
@@ -647,48 +598,19 @@ def get_possessables_for_sequence(level_sequence):
 
 def get_blueprints_using_skeleton(skeleton_path, asset_registry=None, mesh_string=None):
     """
-    Finds all Blueprints using a given skeleton, prioritizing CinematicCharacter Blueprints,
-    and only checks for CinematicCharacter, Actor, and Character Blueprints.
+    Finds all Blueprints using a given skeleton through one of their skeletal meshes, resolved from
+    registry tags and references by the session's skeleton index instead of loading every dependency.
     :param skeleton_path: The asset path of the skeleton (e.g., "/Game/Characters/Hero/Hero_Skeleton")
-    :return: A list of Blueprint asset paths, prioritizing CinematicCharacter BPs.
-    """
-    if not asset_registry:
-        asset_registry = unreal.AssetRegistryHelpers.get_asset_registry()
-
-    blueprint_class_path = unreal.TopLevelAssetPath("/Script/Engine.Blueprint")
-    blueprint_assets = asset_registry.get_assets_by_class(blueprint_class_path)
-    cinematic_bps = []
-
-    dependency_options = unreal.AssetRegistryDependencyOptions(
-        include_soft_package_references=True,
-        include_hard_package_references=True,
-        include_searchable_names=True,
-        include_soft_management_references=False,
-        include_hard_management_references=False
-    )
-    for blueprint in blueprint_assets:
-        dependencies = asset_registry.get_dependencies(blueprint.package_name, dependency_options)
-        for dep in dependencies:
-            if 'Script' not in str(dep):
-                dep_asset_data = unreal.EditorAssetLibrary.find_asset_data(dep)
-
-                if dep_asset_data:
-                    test = dep_asset_data.get_asset()
-                    if isinstance(test, unreal.SkeletalMesh):
-
-                        asset = unreal.EditorAssetLibrary.load_asset(dep_asset_data.package_name)
-                        skel = asset.get_editor_property('skeleton')
-                        if skel:
-
-                            package_name = skel.get_path_name().split('.')[0]
-                            if package_name == skeleton_path:
-                                if mesh_string:
-                                    if mesh_string in str(dep_asset_data.package_name):
-                                        cinematic_bps.append(blueprint.get_asset())
-                                        break
-                                else:
-                                    cinematic_bps.append(blueprint.get_asset())
-    return cinematic_bps
+    :param asset_registry: unused, the session's skeleton index reads the registry
+    :param mesh_string: only match through skeletal meshes whose path contains this
+    :return: A list of Blueprint assets, only these are loaded.
+    """
+    blueprints = []
+    for blueprint_path in skeleton_index.get_blueprints(skeleton_path, mesh_string=mesh_string):
+        blueprint = unreal.load_asset(blueprint_path)
+        if blueprint:
+            blueprints.append(blueprint)
+    return blueprints
 
 
 def get_blueprint_binding_in_sequence(blueprint_path, sequence_path):
@@ -772,13 +694,32 @@ def extract_shot_number_from_path(export_path):
     return None
 
 
-def import_gameplay_animations_from_json(anim_dict_path):
+def import_gameplay_animations_from_json(anim_dict_path, cooperative=False, import_batch_size=None):
     """
     Import gameplay animations, replaces Art Source Dir with Content Dir
     :param anim_dict_path: Exported Dict with the data to import
+    :param cooperative: returns the step generator instead of running it, so the bridge can spread it across ticks
+    :param import_batch_size: FBX files per step, defaults to fbx_batch_import.get_import_batch_size(cooperative)
     :return:
     """
+    steps = iter_gameplay_animations_from_json(anim_dict_path,
+                                               import_batch_size or get_import_batch_size(cooperative))
+    if cooperative:
+        return steps
+    return run_steps(steps)
+
+
+def iter_gameplay_animations_from_json(anim_dict_path, import_batch_size=IMPORT_BATCH_SIZE):
+    """
+    Step generator version of import_gameplay_animations_from_json, collects every animation and imports them
+    in batches, yielding progress after each batch
+    :param anim_dict_path: Exported Dict with the data to import
+    :param import_batch_size: FBX files per step
+    :return: the animation paths from the json, once exhausted
+    """
     anim_dict = read_dict_from_file(anim_dict_path)
+    importer = FbxBatchImporter(batch_size=import_batch_size)
+    skeleton_paths = dict()
     for anim_path in anim_dict:
         anim_name = os.path.basename(anim_path).split('.')[0]
         existing_path = find_uasset_path(anim_name)
@@ -789,17 +730,21 @@ def import_gameplay_animations_from_json(anim_dict_path):
                 import_dir = "/Game/Animations"
         else:
             import_dir = os.path.dirname(existing_path)
-        anim_data = anim_dict[anim_path]
-        skeleton_name = anim_data[3]
-        skeleton_path = get_skeleton_path_by_name(skeleton_name)
-        import_animation(anim_path, skeleton_path, import_dir, anim_name)
+        skeleton_name = anim_dict[anim_path][3]
+        if skeleton_name not in skeleton_paths:
+            skeleton_paths[skeleton_name] = get_skeleton_path_by_name(skeleton_name)
+        importer.add(anim_path, skeleton_paths[skeleton_name], import_dir, anim_name)
+
+    with SaveSession():
+        yield from importer.iter_import()
 
-    return anim_dict.keys()
+    return list(anim_dict.keys())
 
 
 def import_animation(anim_path, skeleton_path, destination_path, destination_name):
     """
     Imports an animation asset into Unreal Engine, optionally reimporting if it already exists.
+    An existing asset imported from the same FBX content with the same settings is reused as is.
 
     :param anim_path: Path to the animation FBX file.
     :param skeleton_path: Path to the skeleton asset for the animation.
@@ -807,47 +752,9 @@ def import_animation(anim_path, skeleton_path, destination_path, destination_nam
     :param destination_name: Name for the imported animation asset.
     :return: The path to the imported animation asset.
     """
-    unreal.SystemLibrary.execute_console_command(None, "Interchange.FeatureFlags.Import.FBX 0")
-
-    task = unreal.AssetImportTask()
-    task.set_editor_property('automated', True)
-    task.set_editor_property('filename', anim_path)
-    task.set_editor_property('destination_path', destination_path)
-    task.set_editor_property('destination_name', destination_name)
-    task.set_editor_property('replace_existing', True)
-    task.set_editor_property('save', True)
-
-    fbx_options = build_import_options(skeleton_path)
-    task.set_editor_property('options', fbx_options)
-
-    unreal.AssetToolsHelpers.get_asset_tools().import_asset_tasks([task])
-    return f"{destination_path}/{destination_name}"
-
-
-def build_import_options(skeleton_path):
-    """
-    Creates the import options for importing an animation in Unreal Engine.
-
-    :param skeleton_path: Path to the skeleton asset for the animation.
-    :return: Unreal FBX import UI object with specified settings.
-    """
-    options = unreal.FbxImportUI()
-    options.original_import_type = unreal.FBXImportType.FBXIT_ANIMATION
-    options.import_animations = True
-    options.create_physics_asset = False
-    options.import_mesh = False
-    options.import_rigid_mesh = False
-    options.import_materials = False
-    options.import_textures = False
-    options.import_as_skeletal = False
-    options.skeleton = unreal.load_asset(skeleton_path)
-    options.anim_sequence_import_data.set_editor_property('import_uniform_scale', 1.0)
-    options.anim_sequence_import_data.set_editor_property("import_bone_tracks", True)
-    options.anim_sequence_import_data.set_editor_property('animation_length',
-                                                          unreal.FBXAnimationLengthImportType.FBXALIT_EXPORTED_TIME)
-    options.anim_sequence_import_data.set_editor_property('remove_redundant_keys', False)
-
-    return options
+    importer = FbxBatchImporter()
+    importer.add(anim_path, skeleton_path, destination_path, destination_name)
+    return importer.import_all()[anim_path]
 
 
 def load_level_sequence(sequence_path="/Game/Cinematics/Test_Anim/Test_Anim_shot1/Test_Anim_shot1"):
@@ -1079,27 +986,22 @@ def list_all_maps():
     all_assets = asset_registry.get_assets_by_class("World", True)
     map_paths = []
     for asset_data in all_assets:
-        map_paths.append(asset_data.package_name)
+        map_paths.append(str(asset_data.package_name))
 
-    return
+    return map_paths
 
 
-def find_uasset_path(file_name):
+def find_uasset_path(file_name, class_name=None):
     """
-    Finds the path of a .uasset file by name.
+    Finds the path of a .uasset file by name, through the session's asset index rather than a registry scan.
 
     :param file_name: The name of the asset to find.
+    :param class_name: (Optional) Only match assets of this class, ie "SkeletalMesh".
     :return: Path to the asset if found, None otherwise.
     """
-    asset_registry = unreal.AssetRegistryHelpers.get_asset_registry()
-    asset_data_list = asset_registry.get_all_assets(True)
-
-    for asset_data in asset_data_list:
-        asset_path = unreal.Paths.convert_relative_path_to_full(asset_data.package_name)
-        asset_name = os.path.basename(asset_path)
-        if "IdentityTemplate" not in asset_path:
-            if file_name.lower() == asset_name.lower():
-                return asset_path
+    for package_name in asset_index.find(file_name, class_name):
+        if "IdentityTemplate" not in package_name:
+            return unreal.Paths.convert_relative_path_to_full(package_name)
 
     return None
 
@@ -1250,11 +1152,17 @@ def set_sequence_range(sequence, start_frame, end_frame):
 
 def update_asset_registry_and_save(asset_directory, asset_path):
     """
-    Saves the asset after refreshing, seems necessary from cmd.exe
+    Saves the asset after refreshing, seems necessary from cmd.exe.
+    Inside a SaveSession both are deferred to the session's next flush
     :param asset_directory: directory to refresh assets for
     :param asset_path: asset path to save
     :return:
     """
+    save_session = get_active_session()
+    if save_session:
+        save_session.add(asset_directory, asset_path)
+        return
+
     asset_registry = unreal.AssetRegistryHelpers.get_asset_registry()
     asset_registry.scan_paths_synchronous([asset_directory])
     unreal.EditorAssetLibrary.save_asset(asset_path)
@@ -1295,16 +1203,21 @@ def create_level_sequence(sequence_name, destination_path="/Game/Cinematics/"):
                                                         package_path=destination_path,
                                                         asset_class=unreal.LevelSequence,
                                                         factory=unreal.LevelSequenceFactoryNew())
+        asset_registry_events.notify_change("added", unreal.EditorAssetLibrary.find_asset_data(sequence_path))
 
     return [level_sequence, pre_existing]
 
 
-def create_cinematic_sequence_from_json(anim_dict_path, destination_path="/Game/Cinematics/", from_cmd=True):
+def create_cinematic_sequence_from_json(anim_dict_path, destination_path="/Game/Cinematics/", from_cmd=True,
+                                        cooperative=False, imported_animations=None, import_batch_size=None):
     """
     Creates a cinematic sequence in Unreal Engine from a JSON file.
 
     :param anim_dict_path: Path to the JSON file containing animation data, generated from maya export
     :param destination_path: Path to the directory where the cinematic sequence will be saved in Unreal Engine.
+    :param cooperative: returns the step generator instead of running it, so the bridge can spread it across ticks
+    :param imported_animations: {export_path: asset path} already imported by import_shot_animations_from_json
+    :param import_batch_size: FBX files per step, defaults to fbx_batch_import.get_import_batch_size(cooperative)
     :return: Path to the created sequence.
     """
     #StartUp Map was not loading correctly when running via cmd.exe, so I load via code here to get around the crash
@@ -1318,11 +1231,127 @@ def create_cinematic_sequence_from_json(anim_dict_path, destination_path="/Game/
 
     anim_dict = read_dict_from_file(anim_dict_path)
     sequence_name = os.path.basename(anim_dict_path).split('.')[0]
-    sequence_path = create_cinematic_sequence(anim_dict, sequence_name, destination_path=destination_path)
+    steps = iter_cinematic_sequence(anim_dict, sequence_name, destination_path=destination_path,
+                                    imported_animations=imported_animations,
+                                    import_batch_size=import_batch_size or get_import_batch_size(cooperative))
+    if cooperative:
+        return steps
+    sequence_path = run_steps(steps)
 
     return sequence_path
 
 
+def import_shot_animations_from_json(anim_dict_path, shot_names, destination_path="/Game/Cinematics/"):
+    """
+    Imports the FBX animations of some of a sequence's shots into their shot folders, without creating sequences or
+    touching the level. Several headless editors run this side by side on different shots, then one editor builds
+    the sequence with create_cinematic_sequence_from_json(imported_animations=...) and skips those imports
+
+    :param anim_dict_path: Path to the JSON file containing animation data, generated from maya export
+    :param shot_names: shots from the JSON to import
+    :param destination_path: same destination the sequence will be created in
+    :return: {export_path: animation asset path} for every animation imported
+    """
+    anim_dict = read_dict_from_file(anim_dict_path)
+    sequence_name = os.path.basename(anim_dict_path).split('.')[0]
+    importer = FbxBatchImporter()
+    queue_shot_imports(importer, anim_dict, f"{destination_path}/{sequence_name}", shot_names)
+    # The session scans each shot folder once and saves the imports together
+    with SaveSession():
+        imported_animations = importer.import_all()
+    return imported_animations
+
+
+def queue_shot_imports(importer, anim_dict, sequence_dir, shot_names=None, imported_animations=None):
+    """
+    Adds the FBX animations of a sequence's shots to a batch importer, each going to its shot's folder
+
+    :param importer: FbxBatchImporter to add to
+    :param anim_dict: anim dictionary containing animation data, generated from maya export
+    :param sequence_dir: content folder of the master sequence
+    :param shot_names: (Optional) only these shots, all of them by default
+    :param imported_animations: (Optional) {export_path: asset path} to leave out, if the asset still exists
+    """
+    imported_animations = imported_animations or {}
+    skeleton_paths = dict()
+    for shot_name in shot_names or anim_dict.keys():
+        shot_sequence_dir = f"{sequence_dir}/_{shot_name}"
+        for animation in anim_dict.get(shot_name, []):
+            export_path = animation["export_path"]
+            # Cameras and facial sliders are keyed straight into the sequence, there is no asset to import
+            if animation["name_space"] == "CAM" or "FacialSliders" in export_path:
+                continue
+            if export_path in imported_animations and \
+                    unreal.EditorAssetLibrary.does_asset_exist(imported_animations[export_path]):
+                continue
+            skeleton_name = animation["skeleton"]
+            if skeleton_name not in skeleton_paths:
+                skeleton_paths[skeleton_name] = animation.get("skeleton_path") or get_skeleton_path_by_name(skeleton_name)
+            root, ext = os.path.splitext(export_path)
+            importer.add(export_path, skeleton_paths[skeleton_name], shot_sequence_dir,
+                         os.path.basename(export_path.replace(ext, "")))
+
+
+def run_import_plan_from_json(plan_path, cooperative=False, imported_animations=None, import_batch_size=None):
+    """
+    Builds the sequence an import plan was compiled for, see import_planner.compile_import_plan_from_json
+
+    :param plan_path: plan written by import_planner.write_import_plan
+    :param cooperative: returns the step generator instead of running it, so the bridge can spread it across ticks
+    :param imported_animations: {export_path: asset path} already imported by import_shot_animations_from_json
+    :param import_batch_size: FBX files per step, defaults to fbx_batch_import.get_import_batch_size(cooperative)
+    :return: Path to the created sequence.
+    """
+    steps = iter_import_plan(read_import_plan(plan_path), imported_animations=imported_animations,
+                             import_batch_size=import_batch_size or get_import_batch_size(cooperative))
+    if cooperative:
+        return steps
+    return run_steps(steps)
+
+
+def iter_import_plan(plan, imported_animations=None, import_batch_size=IMPORT_BATCH_SIZE):
+    """
+    Replays an import plan. The skeletons and blueprints it resolved are checked to still exist, then its resolved
+    shot dictionary goes through iter_cinematic_sequence, so the editor builds what the plan listed
+
+    :param plan: from import_planner.compile_import_plan
+    :param imported_animations: {export_path: asset path} already imported
+    :param import_batch_size: FBX files per step
+    :return: Path to the created sequence, once exhausted.
+    """
+    for problem in plan["problems"]:
+        unreal.log_warning(f"Import plan: {problem}")
+
+    checked_paths = set()
+    for operation in plan["operations"]:
+        for key in ("skeleton_path", "blueprint", "skeletal_mesh"):
+            asset_path = operation.get(key)
+            if not asset_path or asset_path in checked_paths:
+                continue
+            if not unreal.EditorAssetLibrary.does_asset_exist(asset_path):
+                raise ValueError(f"{asset_path} planned for {operation['shot']} no longer exists, compile the plan again")
+            checked_paths.add(asset_path)
+
+    return (yield from iter_cinematic_sequence(plan["shots"], plan["sequence_name"],
+                                               destination_path=plan["destination_path"],
+                                               imported_animations=imported_animations,
+                                               import_batch_size=import_batch_size))
+
+
+def reload_loaded_packages(asset_paths):
+    """
+    Reloads the packages this editor already has in memory from what is on disk now, ie animations another editor
+    just imported again. Otherwise the stale copies get bound, dirtied and saved over the new imports
+    :param asset_paths: package paths, the ones not loaded in this editor are skipped
+    :return: number of packages reloaded
+    """
+    packages = [package for package in (unreal.find_package(asset_path) for asset_path in set(asset_paths)) if package]
+    if packages:
+        unreal.EditorLoadingAndSavingUtils.reload_packages(packages, unreal.ReloadPackagesInteractionMode.ASSUME_POSITIVE)
+        unreal.log(f"Reloaded {len(packages)} package(s) written by other editors")
+    return len(packages)
+
+
 def create_cinematic_sequence(anim_dict, sequence_name, destination_path="/Game/Cinematics"):
     """
     Creates a master cinematic sequence and sub-sequences for each shot. Imports animations and adds actors accordingly.
@@ -1332,173 +1361,263 @@ def create_cinematic_sequence(anim_dict, sequence_name, destination_path="/Game/
     :param destination_path: Path to the directory where the cinematic sequence will be saved in Unreal Engine.
     :return: Path to the created master sequence.
     """
+    return run_steps(iter_cinematic_sequence(anim_dict, sequence_name, destination_path=destination_path))
+
+
+def build_shot_row(animation, shot_sequence, shot_sequence_dir, world, facial_control_rig=False,
+                   imported_animations=None):
+    """
+    Binds one export row into a shot sequence, the camera, or the actor / blueprint with its component tracks
+    and animation section or facial control rig keys
+
+    :param animation: row from the export json
+    :param shot_sequence: the shot's LevelSequence
+    :param shot_sequence_dir: content folder of the shot
+    :param world: editor world
+    :param facial_control_rig: bind the blueprint's face with a control rig track
+    :param imported_animations: {export_path: asset path} already imported, missing ones are imported here
+    """
+    imported_animations = imported_animations or {}
+    current_asset_registry = unreal.AssetRegistryHelpers.get_asset_registry()
+    shot_sequence_path = shot_sequence.get_path_name().split('.')[0]
+    start_frame = animation["start_frame"]
+    end_frame = animation["end_frame"]
+    export_path = animation["export_path"]
+    namespace = animation["name_space"]
+    skeleton = animation["skeleton"]
+    blueprint = animation["blueprint"]
+    animation_asset_path = None
+
+    if namespace == "CAM":
+        camera_name = animation["nodes"][0]
+        camera_actor, camera_component = find_camera_component_in_scene()
+        if not camera_actor:
+            camera_actor, camera_possessable, camera_component = add_camera_actor_to_level_sequence(shot_sequence, camera_actor,
+                                                                                camera_name=camera_name)
+        add_camera_anim_to_level_sequence(shot_sequence, camera_actor, world, export_path, [start_frame, end_frame])
+    else:
+        skeleton_path = animation.get("skeleton_path") or get_skeleton_path_by_name(skeleton)
+        if isinstance(blueprint, str):
+            # Resolved ahead of time by import_planner
+            blueprint = unreal.load_asset(blueprint)
+        if not blueprint:
+
+            blueprints = get_blueprints_using_skeleton(skeleton_path, current_asset_registry, mesh_string=namespace.split("_")[0])
+            if not len(blueprints):
+                blueprints = get_blueprints_using_skeleton(skeleton_path, current_asset_registry)
+
+            blueprint = blueprints[0] if blueprints else None
+
+
+        actor, possessable, component_list = None, None, []
+
+        if blueprint:
+
+            blueprint_path = blueprint.get_package().get_name()
+            binding = get_blueprint_binding_in_sequence(blueprint_path, shot_sequence_path)
+
+            if binding:
+                possessable = binding
+
+                actor = get_actor_from_binding(shot_sequence_path, possessable)
+                actor, possessable = add_actor_to_level_sequence(shot_sequence_path, blueprint_path, actor=actor,
+                                                                                 possessable=binding, namespace=namespace)
+            else:
+                actor, possessable = add_actor_to_level_sequence(shot_sequence_path, blueprint_path, namespace=namespace)
+            component_list = add_blueprint_mesh_components_to_level_sequence(blueprint_path,
+                                                                         shot_sequence_path,
+                                                                         actor=actor,
+                                                                         control_rig=facial_control_rig)
+        else:
+            skeletal_mesh_path = skeleton_index.get_skeletal_meshes(skeleton_path)[0]
+            actor, possessable = add_actor_to_level_sequence(shot_sequence_path, skeletal_mesh_path, actor=actor, namespace=namespace)
+            component_list = add_skeletal_mesh_components_to_level_sequence(actor, possessable)
+
+        if "FacialSliders" not in export_path:
+            animation_asset_path = imported_animations.get(export_path)
+            if not animation_asset_path or not unreal.EditorAssetLibrary.does_asset_exist(animation_asset_path):
+                root, ext = os.path.splitext(export_path)
+                animation_asset_path = import_animation(export_path, skeleton_path, shot_sequence_dir,
+                                                    os.path.basename(export_path.replace(ext, "")))
+
+                update_asset_registry_and_save(shot_sequence_dir, animation_asset_path)
+
+        if actor and possessable:
+            if isinstance(actor, unreal.SkeletalMeshActor):
+                add_anim_track_to_possessable(possessable, animation_asset_path)
+            else:
+                top_mesh = get_top_level_mesh_component(actor)
+                top_mesh_name = top_mesh.get_name()
+                top_binding = find_binding_for_component(shot_sequence_path, top_mesh_name)
+                if top_binding:
+                    top_tracks = top_binding.get_tracks()
+                    for t_track in top_tracks:
+                        if isinstance(t_track, unreal.MovieScene3DTransformTrack):
+                            t_sections = t_track.get_sections()
+                            t_section = t_sections[0] if t_sections else t_track.add_section()
+                            set_section_range(t_section, start_frame, end_frame)
+
+                anim_imported = False
+                if component_list:
+                    for item in component_list:
+
+                        if item and not "FacialSliders" in export_path:
+                            component_binding = item
+                            component_name = component_binding.get_display_name() if hasattr(
+                                component_binding, 'get_display_name') else component_binding.get_name()
+
+                            if "FacialJoints" in export_path and "Face" != component_name:
+                                continue
+
+                            if component_binding and not anim_imported:
+                                tracks = component_binding.get_tracks()
+                                if tracks:
+                                    for track in tracks:
+
+                                        if isinstance(track, unreal.MovieSceneSkeletalAnimationTrack):
+                                            sections = track.get_sections()
+                                            section = sections[0] if sections else track.add_section()
+                                            add_anim_to_level_sequence(animation_asset_path, track,
+                                                                       anim_section=section)
+                                            anim_imported = True
+                                            break
+                        else:
+                            if type(item) is list:
+                                component_binding, control_rig_track = item
+                                bindings = shot_sequence.get_bindings()
+                                for binding in bindings:
+                                    for track in binding.get_tracks():
+                                        if track == control_rig_track:
+                                            control_rig_binding = binding
+                                            settings = unreal.MovieSceneUserImportFBXControlRigSettings()
+                                            success = unreal.SequencerTools.import_fbx_to_control_rig(
+                                                world=world,
+                                                sequence=shot_sequence,
+                                                actor_with_control_rig_track=control_rig_binding.get_name(),
+                                                selected_control_rig_names=[],
+                                                import_fbx_control_rig_settings=settings,
+                                                import_filename=export_path)
+
+                                            if not success:
+                                                unreal.log_error("FBX Import to Control Rig failed.")
+                                            break
+
+
+def iter_cinematic_sequence(anim_dict, sequence_name, destination_path="/Game/Cinematics", imported_animations=None,
+                            import_batch_size=IMPORT_BATCH_SIZE):
+    """
+    Step generator version of create_cinematic_sequence, yields progress after every animation and every shot
+    so the bridge tick can build long sequences a piece per frame. Every shot's animations are imported up front
+    in batches, the sequence building pass then uses the imported assets. Saves and registry scans are deferred
+    to a SaveSession, flushed every SAVE_CHECKPOINT_SHOTS shots and when the build ends. Building again over an
+    existing sequence only applies the rows sequence_reconciler finds changed, unchanged shots are left untouched.
+
+    :param anim_dict: anim dictionary containing animation data, generated from maya export
+    :param sequence_name: name of master sequence
+    :param destination_path: Path to the directory where the cinematic sequence will be saved in Unreal Engine.
+    :param imported_animations: {export_path: asset path} imported ahead of time by other editors, used instead of
+        importing those FBX files again
+    :param import_batch_size: FBX files per step of the import stage, keep it small when the bridge tick runs this
+    :return: Path to the created master sequence, once exhausted.
+    """
     world = unreal.get_editor_subsystem(unreal.UnrealEditorSubsystem).get_editor_world()
 
     current_asset_registry = unreal.AssetRegistryHelpers.get_asset_registry()
     sequence_dir = f"{destination_path}/{sequence_name}"
     sequence_path = f"{destination_path}/{sequence_name}/{sequence_name}"
+    imported_animations = imported_animations or {}
+    if imported_animations:
+        # Those packages were written by other processes, make sure this editor's registry has them
+        current_asset_registry.scan_paths_synchronous([sequence_dir], True)
+        reload_loaded_packages(imported_animations.values())
     master_sequence = create_level_sequence(sequence_name, sequence_dir)[0]
 
     shot_track = add_shot_track_to_master_sequence(master_sequence)
-    unreal.EditorAssetLibrary.save_asset(sequence_path)
     update_asset_registry_and_save(sequence_dir, sequence_path)
+
     facial_control_rig_dict = dict()
+    total_shots = len(anim_dict)
+    total_animations = sum(len(animations) for animations in anim_dict.values())
+    completed_animations = 0
+    # Stays None if the build fails before its first shot, ie during the batch import or for an empty json
+    shot_sequence_path = None
+    save_session = SaveSession().open()
     try:
-        for shot_name, animations in anim_dict.items():
-            shot_sequence_name = f"_{shot_name}"
-            shot_sequence_dir = f"{sequence_dir}/{shot_sequence_name}"
-            shot_sequence = create_level_sequence(shot_sequence_name, destination_path=shot_sequence_dir)[0]
-            shot_sequence_path = f"{sequence_dir}/{shot_sequence_name}/{shot_sequence_name}"
-            update_asset_registry_and_save(shot_sequence_dir, shot_sequence_path)
-
-            for i, animation in enumerate(animations):
-                start_frame = animation["start_frame"]
-                end_frame = animation["end_frame"]
-                offset = start_frame
-                export_path = animation["export_path"]
-                namespace = animation["name_space"]
-                skeleton = animation["skeleton"]
-                blueprint = animation["blueprint"]
-                fps = animation['fps']
-                if i == 0:
+        importer = FbxBatchImporter(batch_size=import_batch_size)
+        queue_shot_imports(importer, anim_dict, sequence_dir, imported_animations=imported_animations)
+        if importer.imports:
+            imported_animations = dict(imported_animations)
+            imported_animations.update((yield from importer.iter_import()))
+
+        shot_sections = read_shot_sections(shot_track)
+        for shot_index, (shot_name, animations) in enumerate(anim_dict.items()):
+            plan = plan_shot(shot_name, animations, sequence_dir, imported_animations)
+            shot_sequence_dir = plan["sequence_dir"]
+            shot_sequence_path = plan["sequence_path"]
+            shot_sequence, pre_existing = create_level_sequence(f"_{shot_name}", destination_path=shot_sequence_dir)
+            if not pre_existing:
+                update_asset_registry_and_save(shot_sequence_dir, shot_sequence_path)
+
+            # Only the rows that differ from what the shot was last built from are applied
+            changes = diff_shot(plan, shot_sequence, shot_sections, pre_existing)
+            if animations:
+                start_frame, end_frame = plan["range"]
+                fps = plan["fps"]
+                if master_sequence.get_display_rate().numerator != fps:
                     set_frame_rate(master_sequence, fps)
                     update_asset_registry_and_save(sequence_dir, sequence_path)
-                    set_sequence_range(shot_sequence, start_frame - offset, end_frame - offset)
-                    add_shot_sequence_section_to_shot_track(shot_track, shot_sequence, start_frame, end_frame)
+                if changes.get("shot_range"):
+                    set_sequence_range(shot_sequence, 0, end_frame - start_frame)
                     set_frame_rate(shot_sequence, fps)
+                if changes.get("shot_section"):
+                    add_shot_sequence_section_to_shot_track(shot_track, shot_sequence, start_frame, end_frame)
 
-                if namespace == "CAM":
-                    camera_name = animation["nodes"][0]
-                    camera_actor, camera_component = find_camera_component_in_scene()
-                    if not camera_actor:
-                        camera_actor, camera_possessable, camera_component = add_camera_actor_to_level_sequence(shot_sequence, camera_actor,
-                                                                                            camera_name=camera_name)
-                    add_camera_anim_to_level_sequence(shot_sequence, camera_actor, world, export_path, [start_frame, end_frame])
-                else:
-                    skeleton_path = get_skeleton_path_by_name(skeleton)
-                    if not blueprint:
-
-                        blueprints = get_blueprints_using_skeleton(skeleton_path, current_asset_registry, mesh_string=namespace.split("_")[0])
-                        if not len(blueprints):
-                            blueprints = get_blueprints_using_skeleton(skeleton_path, current_asset_registry)
-
-                        blueprint = blueprints[0] if blueprints else None
-
-
-                    actor, possessable, component_list = None, None, []
+            for animation in animations:
+                export_path = animation["export_path"]
+                namespace = animation["name_space"]
+                if namespace != "CAM":
+                    # Worked out for every row, later rows of a character depend on its earlier ones
                     if not facial_control_rig_dict.get(namespace.split("_")[0]):
-                        facial_control_rig = False
-                        facial_control_rig_dict[namespace.split("_")[0]] = facial_control_rig
-                    else:
-                        facial_control_rig = facial_control_rig_dict[namespace.split("_")[0]]
-
+                        facial_control_rig_dict[namespace.split("_")[0]] = False
                     if "FacialSliders" in export_path:
-                        facial_control_rig = True
-                        facial_control_rig_dict[namespace.split("_")[0]] = facial_control_rig
-
-                    if blueprint:
-
-                        blueprint_path = blueprint.get_package().get_name()
-                        binding = get_blueprint_binding_in_sequence(blueprint_path, shot_sequence_path)
-
-                        if binding:
-                            possessable = binding
-
-                            actor = get_actor_from_binding(shot_sequence_path, possessable)
-                            actor, possessable = add_actor_to_level_sequence(shot_sequence_path, blueprint_path, actor=actor,
-                                                                                             possessable=binding, namespace=namespace)
-                        else:
-                            actor, possessable = add_actor_to_level_sequence(shot_sequence_path, blueprint_path, namespace=namespace)
-                        component_list = add_blueprint_mesh_components_to_level_sequence(blueprint_path,
-                                                                                     shot_sequence_path,
-                                                                                     actor=actor,
-                                                                                     control_rig=facial_control_rig)
-                    else:
-                        skeletal_meshes = find_skeletal_meshes_using_skeleton(skeleton_path)
-
-                        skeletal_mesh = skeletal_meshes[0]
-                        skeletal_mesh_path = find_uasset_path(skeletal_mesh.get_name())
-                        actor, possessable = add_actor_to_level_sequence(shot_sequence_path, skeletal_mesh_path, actor=actor, namespace=namespace)
-                        component_list = add_skeletal_mesh_components_to_level_sequence(actor, possessable)
-
-                    if "FacialSliders" not in export_path:
-                        root, ext = os.path.splitext(export_path)
-                        animation_asset_path = import_animation(export_path, skeleton_path, shot_sequence_dir,
-                                                            os.path.basename(export_path.replace(ext, "")))
-
-                        update_asset_registry_and_save(shot_sequence_dir, animation_asset_path)
-
-                    if actor and possessable:
-                        if isinstance(actor, unreal.SkeletalMeshActor):
-                            add_anim_track_to_possessable(possessable, animation_asset_path)
-                        else:
-                            top_mesh = get_top_level_mesh_component(actor)
-                            top_mesh_name = top_mesh.get_name()
-                            top_binding = find_binding_for_component(shot_sequence_path, top_mesh_name)
-                            if top_binding:
-                                top_tracks = top_binding.get_tracks()
-                                for t_track in top_tracks:
-                                    if isinstance(t_track, unreal.MovieScene3DTransformTrack):
-                                        t_sections = t_track.get_sections()
-                                        t_section = t_sections[0] if t_sections else t_track.add_section()
-                                        set_section_range(t_section, start_frame, end_frame)
-
-                            anim_imported = False
-                            if component_list:
-                                for item in component_list:
-
-                                    if item and not "FacialSliders" in export_path:
-                                        component_binding = item
-                                        component_name = component_binding.get_display_name() if hasattr(
-                                            component_binding, 'get_display_name') else component_binding.get_name()
-
-                                        if "FacialJoints" in export_path and "Face" != component_name:
-                                            continue
-
-                                        if component_binding and not anim_imported:
-                                            tracks = component_binding.get_tracks()
-                                            if tracks:
-                                                for track in tracks:
-
-                                                    if isinstance(track, unreal.MovieSceneSkeletalAnimationTrack):
-                                                        sections = track.get_sections()
-                                                        section = sections[0] if sections else track.add_section()
-                                                        add_anim_to_level_sequence(animation_asset_path, track,
-                                                                                   anim_section=section)
-                                                        anim_imported = True
-                                                        break
-                                    else:
-                                        if type(item) is list:
-                                            component_binding, control_rig_track = item
-                                            bindings = shot_sequence.get_bindings()
-                                            for binding in bindings:
-                                                for track in binding.get_tracks():
-                                                    if track == control_rig_track:
-                                                        control_rig_binding = binding
-                                                        settings = unreal.MovieSceneUserImportFBXControlRigSettings()
-                                                        success = unreal.SequencerTools.import_fbx_to_control_rig(
-                                                            world=world,
-                                                            sequence=shot_sequence,
-                                                            actor_with_control_rig_track=control_rig_binding.get_name(),
-                                                            selected_control_rig_names=[],
-                                                            import_fbx_control_rig_settings=settings,
-                                                            import_filename=export_path)
-
-                                                        if not success:
-                                                            unreal.log_error("FBX Import to Control Rig failed.")
-                                                        break
-            update_asset_registry_and_save(shot_sequence_dir, shot_sequence_path)
-    except:
+                        facial_control_rig_dict[namespace.split("_")[0]] = True
+
+                row_key = get_row_key(animation)
+                if row_key in changes.get("build_rows", []):
+                    build_shot_row(animation, shot_sequence, shot_sequence_dir, world,
+                                   facial_control_rig=facial_control_rig_dict.get(namespace.split("_")[0], False),
+                                   imported_animations=imported_animations)
+                elif row_key in changes.get("update_rows", {}):
+                    for track, section in changes["update_rows"][row_key]:
+                        add_anim_to_level_sequence(plan["rows"][row_key]["animation_path"], track,
+                                                   anim_section=section)
+
+                completed_animations += 1
+                yield {"shot": shot_name, "animation": export_path, "completed_shots": shot_index,
+                       "total_shots": total_shots, "completed_animations": completed_animations,
+                       "total_animations": total_animations}
+            if changes:
+                remove_shot_rows(changes["remove_rows"])
+                write_shot_state(shot_sequence, plan)
+                update_asset_registry_and_save(shot_sequence_dir, shot_sequence_path)
+            save_session.checkpoint()
+            yield {"shot": shot_name, "animation": None, "completed_shots": shot_index + 1,
+                   "total_shots": total_shots, "completed_animations": completed_animations,
+                   "total_animations": total_animations}
+    except Exception as e:
+        unreal.log_error(f"Building {sequence_name} failed: {e}")
         unreal.SystemLibrary.collect_garbage()
     finally:
         update_asset_registry_and_save(sequence_dir, sequence_path)
+        save_session.close()
         unreal.LevelSequenceEditorBlueprintLibrary.close_level_sequence()
         current_world = unreal.EditorLevelLibrary.get_editor_world()
         current_level_path = current_world.get_path_name()
         unreal.EditorLevelLibrary.save_current_level()
         unreal.EditorLevelLibrary.load_level(current_level_path)
-        shot_sequence = load_level_sequence(shot_sequence_path)
-        unreal.LevelSequenceEditorBlueprintLibrary.open_level_sequence(shot_sequence)
+        if shot_sequence_path:
+            shot_sequence = load_level_sequence(shot_sequence_path)
+            unreal.LevelSequenceEditorBlueprintLibrary.open_level_sequence(shot_sequence)
 
     return sequence_path
 
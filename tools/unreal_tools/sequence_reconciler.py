@@ -0,0 +1,188 @@
+import unreal
+import os
+import json
+import hashlib
+import collections
+from unreal_tools.fbx_batch_import import get_file_hash
+
+# Metadata tag on each shot sequence holding the plan it was last built from
+SHOT_STATE_TAG = "TEW.ShotState"
+# Bump when the way shots are built changes, so every shot is built again once
+SHOT_STATE_VERSION = 1
+
+
+def get_fingerprint(data):
+    return hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def get_row_key(animation):
+    """
+    :return: key of an export row within its shot
+    """
+    return f"{animation['name_space']}|{animation['export_path']}"
+
+
+def get_row_kind(animation):
+    """
+    :return: "camera", "facial" for control rig curves, or "animation" for a skeletal animation section
+    """
+    if animation["name_space"] == "CAM":
+        return "camera"
+    if "FacialSliders" in animation["export_path"]:
+        return "facial"
+    return "animation"
+
+
+def plan_shot(shot_name, animations, sequence_dir, imported_animations=None):
+    """
+    Desired state of a shot, worked out from its rows in the export json without touching Unreal.
+    Every row gets a layout fingerprint (what it binds and where) and a full fingerprint that also covers
+    the FBX content, so a re-exported file and a changed row can be told apart
+
+    :param shot_name: shot key in the json
+    :param animations: the shot's rows
+    :param sequence_dir: content folder of the master sequence
+    :param imported_animations: {export_path: asset path} from the import stage
+    :return: {"name", "sequence_dir", "sequence_path", "range", "fps", "rows", "fingerprint"}
+    """
+    imported_animations = imported_animations or {}
+    shot_sequence_name = f"_{shot_name}"
+    shot_sequence_dir = f"{sequence_dir}/{shot_sequence_name}"
+    rows = collections.OrderedDict()
+    for animation in animations:
+        export_path = animation["export_path"]
+        kind = get_row_kind(animation)
+        animation_path = None
+        if kind == "animation":
+            root, ext = os.path.splitext(export_path)
+            animation_path = imported_animations.get(export_path) or \
+                f"{shot_sequence_dir}/{os.path.basename(export_path.replace(ext, ''))}"
+        layout = get_fingerprint([SHOT_STATE_VERSION, kind, animation_path, animation])
+        rows[get_row_key(animation)] = {
+            "kind": kind,
+            "animation_path": animation_path,
+            "layout": layout,
+            "fingerprint": get_fingerprint([layout, get_file_hash(export_path)])
+        }
+
+    first = animations[0] if animations else {}
+    shot_range = [first.get("start_frame"), first.get("end_frame")]
+    return {
+        "name": shot_name,
+        "sequence_dir": shot_sequence_dir,
+        "sequence_path": f"{shot_sequence_dir}/{shot_sequence_name}",
+        "range": shot_range,
+        "fps": first.get("fps"),
+        "rows": rows,
+        "fingerprint": get_fingerprint([shot_range, first.get("fps"), [row["fingerprint"] for row in rows.values()]])
+    }
+
+
+def read_shot_stamp(shot_sequence):
+    """
+    :return: the state written by write_shot_state, an empty one for a shot we haven't built
+    """
+    stamp = unreal.EditorAssetLibrary.get_metadata_tag(shot_sequence, SHOT_STATE_TAG)
+    try:
+        state = json.loads(stamp) if stamp else {}
+    except ValueError:
+        state = {}
+    return {"fingerprint": state.get("fingerprint"), "rows": state.get("rows", {})}
+
+
+def write_shot_state(shot_sequence, plan):
+    """
+    Records the plan a shot was built from on the shot sequence, saved with it
+    """
+    rows = {key: {"kind": row["kind"], "animation_path": row["animation_path"], "layout": row["layout"],
+                  "fingerprint": row["fingerprint"]} for key, row in plan["rows"].items()}
+    state = {"fingerprint": plan["fingerprint"], "rows": rows}
+    unreal.EditorAssetLibrary.set_metadata_tag(shot_sequence, SHOT_STATE_TAG, json.dumps(state, sort_keys=True))
+
+
+def read_shot_sections(master_shot_track):
+    """
+    :return: {shot sequence path: [start frame, end frame]} for the master sequence's shot sections
+    """
+    shot_sections = {}
+    for section in master_shot_track.get_sections():
+        sub_sequence = section.get_editor_property('sub_sequence')
+        if sub_sequence:
+            shot_sections[sub_sequence.get_path_name().split('.')[0]] = [section.get_start_frame(),
+                                                                         section.get_end_frame()]
+    return shot_sections
+
+
+def read_animation_sections(shot_sequence):
+    """
+    :return: {animation asset path: [[track, section], ...]} for every skeletal animation section in the shot
+    """
+    animation_sections = {}
+    for binding in shot_sequence.get_bindings():
+        for track in binding.get_tracks():
+            if not isinstance(track, unreal.MovieSceneSkeletalAnimationTrack):
+                continue
+            for section in track.get_sections():
+                animation = section.get_editor_property('params').get_editor_property('animation')
+                if animation:
+                    animation_path = animation.get_path_name().split('.')[0]
+                    animation_sections.setdefault(animation_path, []).append([track, section])
+    return animation_sections
+
+
+def diff_shot(plan, shot_sequence, shot_sections, pre_existing=True):
+    """
+    Compares a shot's plan with what its sequence holds and lists the smallest set of changes to apply.
+    A shot whose fingerprint and master section still match is skipped without reading its bindings
+
+    :param plan: from plan_shot
+    :param shot_sequence: the shot's LevelSequence
+    :param shot_sections: from read_shot_sections
+    :param pre_existing: False for a shot sequence created by this build, every row is built
+    :return: {"shot_range": bool, "shot_section": bool, "build_rows": [keys], "update_rows": {key: [[track, section]]},
+        "remove_rows": {key: stored row}}, changes is empty when nothing needs doing
+    """
+    changes = {"shot_range": not pre_existing, "shot_section": shot_sections.get(plan["sequence_path"]) != plan["range"],
+               "build_rows": [], "update_rows": {}, "remove_rows": {}}
+    if not pre_existing:
+        changes["build_rows"] = list(plan["rows"])
+        return changes
+
+    stamp = read_shot_stamp(shot_sequence)
+    if stamp["fingerprint"] == plan["fingerprint"]:
+        return changes if changes["shot_section"] else {}
+
+    stored_rows = stamp["rows"]
+    changes["shot_range"] = True
+    animation_sections = read_animation_sections(shot_sequence)
+    for key, row in plan["rows"].items():
+        stored = stored_rows.get(key, {})
+        sections = animation_sections.get(row["animation_path"]) if row["kind"] == "animation" else None
+        if stored.get("fingerprint") == row["fingerprint"] and (row["kind"] != "animation" or sections):
+            continue
+        if sections and stored.get("layout") == row["layout"]:
+            # Only the FBX content changed, the section just needs to pick up the reimported animation
+            changes["update_rows"][key] = sections
+        else:
+            changes["build_rows"].append(key)
+
+    for key, stored in stored_rows.items():
+        if key not in plan["rows"]:
+            changes["remove_rows"][key] = dict(stored, sections=animation_sections.get(stored.get("animation_path"), []))
+    return changes
+
+
+def remove_shot_rows(remove_rows):
+    """
+    Removes what rows dropped from the json left in a shot. Animation sections are removed,
+    cameras and facial curves have nothing that ties them to a row, so those are only reported
+
+    :param remove_rows: from diff_shot
+    """
+    for key, stored in remove_rows.items():
+        if stored.get("kind") != "animation":
+            unreal.log_warning(f"Row {key} is no longer exported, remove its {stored.get('kind')} tracks by hand")
+            continue
+        for track, section in stored["sections"]:
+            track.remove_section(section)
+        unreal.log(f"Removed {len(stored['sections'])} section(s) of {key} from the shot")
@@ -1,8 +1,185 @@
 import os
+import sys
 import json
-import winreg
 import glob
 import re
+import configparser
+from utilities.json_data import write_json_atomic
+
+try:
+    import winreg
+except ImportError:
+    # Not on Windows, installs are found through Install.ini and the default locations instead
+    winreg = None
+
+# Engine binaries folder, commandlet executable and editor executable per platform
+EDITOR_BINARIES = {
+    "win32": ("Win64", "UnrealEditor-Cmd.exe", "UnrealEditor.exe"),
+    "linux": ("Linux", "UnrealEditor-Cmd", "UnrealEditor"),
+}
+# Overrides the engine install for every project, ie a farm node with a single engine unpacked somewhere custom
+ENGINE_DIR_ENV = "TEW_UNREAL_ENGINE_DIR"
+# Resolved project context, cached per project under its Saved folder
+PROJECT_CONTEXT_CACHE = os.path.join("Saved", "TheEntireWorld", "project_context.json")
+# Bumped when ProjectContext changes shape, so older cache files are resolved again
+PROJECT_CONTEXT_VERSION = 1
+# Asset catalogue the editor writes next to the .uproject, and the layout version readers understand
+CATALOGUE_FILE_NAME = "TheEntireWorld.catalogue.json"
+CATALOGUE_VERSION = 1
+
+project_contexts = {}
+project_catalogues = {}
+
+
+class ProjectContext(object):
+    """
+    Everything resolved about an Unreal project that doesn't change until the .uproject does: the engine
+    association, the engine install and its editor binaries, and the project's log and config folders
+    """
+    def __init__(self, uproject_path, engine_association=None, engine_dir=None, cmd_exe=None, editor_exe=None):
+        self.uproject_path = uproject_path
+        self.project_name = os.path.basename(uproject_path).split('.')[0]
+        self.project_dir = os.path.dirname(uproject_path)
+        self.log_dir = os.path.join(self.project_dir, "Saved", "Logs")
+        self.config_dir = os.path.join(self.project_dir, "Config")
+        self.default_engine_ini = os.path.join(self.config_dir, "DefaultEngine.ini")
+        self.engine_association = engine_association
+        self.engine_dir = engine_dir
+        self.cmd_exe = cmd_exe
+        self.editor_exe = editor_exe
+
+    @classmethod
+    def resolve(cls, uproject_path):
+        """
+        Reads the .uproject and looks up its engine install and binaries for this platform
+        :param uproject_path: actual uproject path
+        :return: ProjectContext, engine fields are None when the engine can't be found
+        """
+        engine_association = get_engine_association(uproject_path)
+        engine_dir = get_unreal_install_path(engine_association) if engine_association else None
+        cmd_exe, editor_exe = get_editor_binaries(engine_dir) if engine_dir else (None, None)
+        return cls(uproject_path, engine_association, engine_dir, cmd_exe, editor_exe)
+
+    def to_dict(self):
+        return {
+            "uproject_path": self.uproject_path,
+            "engine_association": self.engine_association,
+            "engine_dir": self.engine_dir,
+            "cmd_exe": self.cmd_exe,
+            "editor_exe": self.editor_exe
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["uproject_path"], data.get("engine_association"), data.get("engine_dir"),
+                   data.get("cmd_exe"), data.get("editor_exe"))
+
+
+def get_project_context(uproject_path, refresh=False):
+    """
+    Returns the project's resolved context, only rediscovering the engine when the .uproject has changed.
+    Kept in memory for this session and in a small cache file keyed by the .uproject's mtime, so a new
+    Maya session or farm job reads one file instead of the registry and install folders. A context whose engine
+    was not found is never cached, so installing the engine or setting ENGINE_DIR_ENV takes effect straight away
+    :param uproject_path: actual uproject path
+    :param refresh: ignore both caches and resolve again
+    :return: ProjectContext, or None if the uproject doesn't exist
+    """
+    try:
+        uproject_mtime = os.path.getmtime(uproject_path)
+    except OSError:
+        return None
+
+    uproject_path = os.path.normpath(uproject_path)
+    cached = project_contexts.get(uproject_path)
+    if not refresh and cached and cached[0] == uproject_mtime:
+        return cached[1]
+
+    cache_path = os.path.join(os.path.dirname(uproject_path), PROJECT_CONTEXT_CACHE)
+    context = None if refresh else read_project_context_cache(cache_path, uproject_path, uproject_mtime)
+    if not context:
+        context = ProjectContext.resolve(uproject_path)
+        if context.cmd_exe:
+            write_project_context_cache(cache_path, context, uproject_mtime)
+
+    if context.cmd_exe:
+        project_contexts[uproject_path] = (uproject_mtime, context)
+    return context
+
+
+def read_project_context_cache(cache_path, uproject_path, uproject_mtime):
+    """
+    :return: the cached ProjectContext if it was resolved from this version of the .uproject, on this platform,
+        and its binaries are still there, otherwise None
+    """
+    try:
+        with open(cache_path, "r") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if cache.get("version") != PROJECT_CONTEXT_VERSION or cache.get("platform") != sys.platform:
+        return None
+    if cache.get("uproject_mtime") != uproject_mtime or cache.get("context", {}).get("uproject_path") != uproject_path:
+        return None
+
+    context = ProjectContext.from_dict(cache["context"])
+    # An engine that was uninstalled or moved has to be looked up again, and so does one that was never found
+    if not context.cmd_exe or not os.path.exists(context.cmd_exe):
+        return None
+    return context
+
+
+def write_project_context_cache(cache_path, context, uproject_mtime):
+    """
+    Writes the cache file, failing quietly since a read only or synced project only loses the cache
+    """
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        write_json_atomic({
+            "version": PROJECT_CONTEXT_VERSION,
+            "platform": sys.platform,
+            "uproject_mtime": uproject_mtime,
+            "context": context.to_dict()
+        }, cache_path, indent=4)
+    except OSError:
+        pass
+
+
+def get_catalogue_path(uproject_path):
+    """
+    :return: path of the asset catalogue for the project, next to its .uproject
+    """
+    return os.path.join(os.path.dirname(uproject_path), CATALOGUE_FILE_NAME)
+
+
+def read_project_catalogue(uproject_path):
+    """
+    Reads the asset catalogue the editor keeps up to date through project_catalogue.py, so skeletons, meshes,
+    blueprints and control rigs are known without Unreal running. The file is only parsed again when it changes
+    :param uproject_path: actual uproject path
+    :return: catalogue dictionary with "stamp", "skeletons" and "control_rigs", None if there is no usable catalogue
+    """
+    catalogue_path = get_catalogue_path(uproject_path)
+    try:
+        catalogue_mtime = os.path.getmtime(catalogue_path)
+    except OSError:
+        return None
+
+    cached = project_catalogues.get(catalogue_path)
+    if cached and cached[0] == catalogue_mtime:
+        return cached[1]
+
+    try:
+        with open(catalogue_path, "r") as f:
+            catalogue = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if catalogue.get("version") != CATALOGUE_VERSION:
+        return None
+
+    project_catalogues[catalogue_path] = (catalogue_mtime, catalogue)
+    return catalogue
 
 
 def get_engine_association(uproject_path):
@@ -20,40 +197,81 @@ def get_unreal_cmd_exe(uproject_path):
     """
     Returns the Engine cmd exe location for the uproject
     :param uproject_path: actual uproject path
-    :return: If found, returns the cmd.exe for the unreal version
+    :return: If found, returns UnrealEditor-Cmd for the unreal version on this platform
     """
-    if not os.path.exists(uproject_path):
-        return None
-
-    # Read the uproject file to get EngineAssociation
-    with open(uproject_path, 'r') as f:
-        uproject_data = json.load(f)
-
-    engine_association = uproject_data.get("EngineAssociation", None)
-
-    if not engine_association:
-        return None
-
-    # Check registry for installed Unreal Engine versions
-    ue_install_path = get_unreal_install_path(engine_association)
+    context = get_project_context(uproject_path)
+    return context.cmd_exe if context else None
 
-    if not ue_install_path:
-        return None
 
-    # Construct the path to UnrealEditor-Cmd.exe
-    cmd_exe_path = os.path.join(ue_install_path, "Engine", "Binaries", "Win64", "UnrealEditor-Cmd.exe")
+def get_editor_binaries(install_path):
+    """
+    :param install_path: engine install folder, the one containing Engine
+    :return: [UnrealEditor-Cmd path, UnrealEditor path] for this platform, either is None if it isn't there
+    """
+    platform_key = "win32" if sys.platform == "win32" else "linux" if sys.platform.startswith("linux") else None
+    if not platform_key:
+        return [None, None]
 
-    return cmd_exe_path if os.path.exists(cmd_exe_path) else None
+    binaries_dir, cmd_name, editor_name = EDITOR_BINARIES[platform_key]
+    binaries_path = os.path.join(install_path, "Engine", "Binaries", binaries_dir)
+    binaries = []
+    for name in (cmd_name, editor_name):
+        path = os.path.join(binaries_path, name)
+        binaries.append(path if os.path.exists(path) else None)
+    return binaries
 
 
 def get_unreal_install_path(engine_version):
     """
-    Check the Windows Registry for Unreal Engine install locations.
+    Finds the install for an engine association: a launcher version like "5.5", or the id of a source build.
+    Checks TEW_UNREAL_ENGINE_DIR, then the Windows Registry or the Linux Install.ini, then default locations
 
     :param engine_version: after finding engine version, it fills in the rest
     :return:
     """
+    engine_dir = os.environ.get(ENGINE_DIR_ENV)
+    if engine_dir and os.path.isdir(engine_dir):
+        return engine_dir
+
+    if winreg:
+        install_path = get_registry_install_path(engine_version)
+        if install_path:
+            return install_path
+    else:
+        install_path = get_install_ini_path(engine_version)
+        if install_path:
+            return install_path
+
+    # Fallback: Check default install locations
+    if sys.platform == "win32":
+        default_paths = [
+            f"C:/Program Files/Epic Games/UE_{engine_version}",
+            f"D:/Program Files/Epic Games/UE_{engine_version}"
+        ]
+    else:
+        default_paths = [
+            os.path.expanduser(f"~/UnrealEngine/UE_{engine_version}"),
+            os.path.expanduser(f"~/UE_{engine_version}"),
+            f"/opt/UnrealEngine/UE_{engine_version}",
+            f"/opt/UE_{engine_version}",
+            os.path.expanduser("~/UnrealEngine"),
+            "/opt/UnrealEngine"
+        ]
+
+    for path in default_paths:
+        if os.path.exists(os.path.join(path, "Engine")):
+            return path
+
+    return None
 
+
+def get_registry_install_path(engine_version):
+    """
+    Check the Windows Registry for Unreal Engine install locations, launcher installs live under
+    HKEY_LOCAL_MACHINE and source builds under the current user's Builds key
+    :param engine_version: launcher version or source build id
+    :return: install path, or None
+    """
     unreal_reg_path = r"SOFTWARE\Epic Games\Unreal Engine"
 
     try:
@@ -72,16 +290,35 @@ def get_unreal_install_path(engine_version):
     except FileNotFoundError:
         pass
 
-    # Fallback: Check default install locations
-    default_paths = [
-        f"C:/Program Files/Epic Games/UE_{engine_version}",
-        f"D:/Program Files/Epic Games/UE_{engine_version}"
-    ]
+    try:
+        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, unreal_reg_path + r"\Builds") as key:
+            install_path, _ = winreg.QueryValueEx(key, engine_version)
+            return install_path
+    except OSError:
+        pass
+
+    return None
 
-    for path in default_paths:
-        if os.path.exists(path):
-            return path
 
+def get_install_ini_path(engine_version):
+    """
+    Check ~/.config/Epic/UnrealEngine/Install.ini, where Linux builds register themselves
+    :param engine_version: launcher version or source build id
+    :return: install path, or None
+    """
+    install_ini = os.path.expanduser("~/.config/Epic/UnrealEngine/Install.ini")
+    if not os.path.exists(install_ini):
+        return None
+
+    config = configparser.ConfigParser(strict=False)
+    # Build ids are case sensitive
+    config.optionxform = str
+    try:
+        config.read(install_ini)
+    except configparser.Error:
+        return None
+    if config.has_option("Installations", engine_version):
+        return config.get("Installations", engine_version)
     return None
 
 
@@ -111,6 +348,76 @@ def get_latest_unreal_log(uproject_path):
     return latest_log
 
 
+class UnrealLogTailer(object):
+    """
+    Follows a project's Unreal logs, reading only the bytes written since the last call.
+    Every Saved/Logs/<Project>*.log is followed with its own offset, so a second editor or commandlet writing
+    <Project>_2.log is picked up too. Offsets are kept per file identity rather than name, so when the editor
+    rotates <Project>.log to a backup and starts a new one, the backup is not read again and the new log is read
+    from its start
+    """
+    def __init__(self, uproject_path, job_tag=None, from_start=False):
+        """
+        :param uproject_path: actual uproject path
+        :param job_tag: only lines containing this text are returned, ie the tag a commandlet job logs with
+        :param from_start: read the logs already on disk from the beginning instead of only what comes next
+        """
+        proj_base_name = os.path.basename(uproject_path).split('.')[0]
+        self.log_pattern = os.path.join(os.path.dirname(uproject_path), "Saved", "Logs", f"{proj_base_name}*.log")
+        self.job_tag = job_tag
+        self.offsets = {}
+        self.partial_lines = {}
+        if not from_start:
+            for log_path, file_id, size in self.get_log_files():
+                self.offsets[file_id] = size
+
+    def get_log_files(self):
+        """
+        :return: list of [log path, file identity, size] for the project's logs
+        """
+        log_files = []
+        for log_path in glob.glob(self.log_pattern):
+            try:
+                stat = os.stat(log_path)
+            except OSError:
+                continue
+            file_id = (stat.st_dev, stat.st_ino) if stat.st_ino else log_path
+            log_files.append([log_path, file_id, stat.st_size])
+        return log_files
+
+    def read_lines(self):
+        """
+        :return: complete lines written since the last call, oldest first per log, filtered by job_tag
+        """
+        lines = []
+        for log_path, file_id, size in self.get_log_files():
+            offset = self.offsets.get(file_id, 0)
+            if size < offset:
+                # Truncated or replaced in place, start over
+                offset = 0
+                self.partial_lines.pop(file_id, None)
+            if size == offset:
+                continue
+
+            try:
+                with open(log_path, "rb") as f:
+                    f.seek(offset)
+                    data = f.read(size - offset)
+            except OSError:
+                continue
+            self.offsets[file_id] = offset + len(data)
+
+            complete, newline, partial = (self.partial_lines.get(file_id, b"") + data).rpartition(b"\n")
+            self.partial_lines[file_id] = partial
+            if not newline:
+                continue
+            for raw_line in complete.split(b"\n"):
+                line = raw_line.decode("utf-8", "replace").rstrip("\r")
+                if not self.job_tag or self.job_tag in line:
+                    lines.append(line)
+        return lines
+
+
 def add_unreal_startup_script(uproject_path, script_path):
     """
     Adds a startup script to DefaultEngine.ini for a given Unreal project.
@@ -2,15 +2,537 @@ import subprocess
 import time
 import os
 import json
-import requests
+import gzip
+import socket
+import threading
+import tempfile
+import uuid
+import http.client
+import urllib.parse
+from unreal_tools import unreal_project_data
+
+BRIDGE_URL = "http://127.0.0.1:12347"
+# Connect timeout and the longest gap allowed between progress events (the bridge sends keep-alives every 15s)
+BRIDGE_TIMEOUT = (2, 60)
+# Idle connections kept open to the bridge, and how long one may sit idle (the bridge drops them after 30s)
+BRIDGE_MAX_CONNECTIONS = 4
+BRIDGE_IDLE_SECONDS = 20
+# Seconds a liveness probe result is trusted, and how long the probe may take against a local editor
+LIVENESS_CACHE_SECONDS = 5.0
+LIVENESS_TIMEOUT = 0.5
+# Errors that mean a reused keep-alive connection was closed by the bridge before our request reached it
+STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+# Headless worker used when the editor bridge is not running: seconds it may take to boot, seconds one call may
+# run (whole cinematic imports are a single call), and seconds it stays warm after its last call
+WORKER_START_TIMEOUT = 900
+WORKER_TIMEOUT = (2, 4 * 60 * 60)
+WORKER_IDLE_TIMEOUT = 900
+# Headless editors importing a cinematic's shots side by side, 1 keeps the import in a single editor
+CINEMATIC_IMPORT_WORKERS = int(os.environ.get("TEW_IMPORT_WORKERS", 1))
+# Seconds between reads of the Unreal log for a one-off commandlet's progress
+COMMANDLET_POLL_INTERVAL = 0.5
+JOB_POLL_INTERVAL = 1.0
+# Seconds to keep retrying a call the bridge turned away with 503 because its queue was full
+BRIDGE_BUSY_TIMEOUT = 300
+JOB_DONE_STATUSES = ("finished", "failed", "cancelled")
+# Ask for record results packed as columns and gzipped, read_bridge_response unpacks them again
+BRIDGE_HEADERS = {"X-Bridge-Format": "columnar", "Accept-Encoding": "gzip"}
+
+
+def from_columnar(data):
+    """
+    Unpacks a columnar bridge response back into the list or dict of records the Unreal function returned
+    :param data: decoded json body
+    :return: original result
+    """
+    if not isinstance(data, dict) or data.get("__columnar__") != 1:
+        return data
+
+    columns = data["columns"]
+    records = [dict(zip(columns, row)) for row in data["rows"]]
+    if "keys" in data:
+        return dict(zip(data["keys"], records))
+    return records
+
+
+def read_bridge_response(response):
+    """
+    Decodes a bridge response whatever format it was sent in, gzip is already undone by BridgeClient
+    :param response: BridgeResponse from the bridge
+    :return: decoded body
+    """
+    data = response.json()
+    if response.headers.get("X-Bridge-Format") == "columnar":
+        return from_columnar(data)
+    return data
+
+
+class BridgeError(Exception):
+    """
+    Raised when the bridge answers with an error status, or a call to it fails part way
+    """
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class BridgeUnavailable(BridgeError):
+    """
+    Raised straight away when the Unreal editor bridge is not running, so callers can fall back to a commandlet
+    """
+
+
+class BridgeResponse(object):
+    """
+    Status, headers and body of one bridge response, the body already un-gzipped
+    """
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+        return json.loads(self.body.decode("utf-8")) if self.body else None
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise BridgeError(f"Bridge returned {self.status}: {self.body.decode('utf-8', 'replace')[:500]}",
+                              status=self.status)
+
+
+class BridgeClient(object):
+    """
+    Talks to the Unreal editor bridge over a small pool of HTTP/1.1 keep-alive connections, stdlib only so
+    Maya and MotionBuilder need nothing installed. Whether the editor is up is probed once and cached,
+    so a closed editor costs milliseconds instead of a connection timeout on every call
+    """
+    def __init__(self, url=BRIDGE_URL, timeout=BRIDGE_TIMEOUT, max_connections=BRIDGE_MAX_CONNECTIONS):
+        """
+        :param url: bridge address, ie "http://127.0.0.1:12347"
+        :param timeout: (connect seconds, read seconds)
+        :param max_connections: idle connections kept open for reuse
+        """
+        parsed_url = urllib.parse.urlsplit(url)
+        self.host = parsed_url.hostname
+        self.port = parsed_url.port or 80
+        self.connect_timeout, self.read_timeout = timeout
+        self.max_connections = max_connections
+        self.idle_connections = []
+        self.lock = threading.Lock()
+        self.alive = None
+        self.alive_checked_at = 0.0
+
+    def open_connection(self):
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=self.connect_timeout)
+        connection.connect()
+        connection.sock.settimeout(self.read_timeout)
+        # Calls are small request / response pairs, don't let Nagle hold them back
+        connection.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return connection
+
+    def acquire_connection(self):
+        """
+        :return: [connection, True if it was reused from the pool]
+        """
+        now = time.monotonic()
+        with self.lock:
+            while self.idle_connections:
+                connection, last_used = self.idle_connections.pop()
+                if now - last_used < BRIDGE_IDLE_SECONDS:
+                    return [connection, True]
+                connection.close()
+        return [self.open_connection(), False]
+
+    def release_connection(self, connection):
+        with self.lock:
+            if len(self.idle_connections) < self.max_connections:
+                self.idle_connections.append([connection, time.monotonic()])
+                return
+        connection.close()
+
+    def close(self):
+        with self.lock:
+            idle_connections, self.idle_connections = self.idle_connections, []
+        for connection, last_used in idle_connections:
+            connection.close()
+
+    def set_alive(self, alive):
+        self.alive = alive
+        self.alive_checked_at = time.monotonic()
+        if not alive:
+            self.close()
+
+    def is_alive(self, refresh=False):
+        """
+        Probes GET /ping, the answer is cached for LIVENESS_CACHE_SECONDS
+        :param refresh: ignore the cached answer
+        :return: True if the editor bridge is answering
+        """
+        if not refresh and self.alive is not None and time.monotonic() - self.alive_checked_at < LIVENESS_CACHE_SECONDS:
+            return self.alive
+
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=LIVENESS_TIMEOUT)
+        try:
+            connection.request("GET", "/ping")
+            response = connection.getresponse()
+            response.read()
+            alive = response.status == 200
+        except (OSError, http.client.HTTPException):
+            alive = False
+        finally:
+            connection.close()
+        self.set_alive(alive)
+        return alive
+
+    def request(self, method, path, payload=None, headers=None):
+        """
+        :param method: "GET", "POST" or "DELETE"
+        :param path: bridge path, ie "/jobs"
+        :param payload: json serializable body, or None
+        :param headers: extra request headers
+        :raises BridgeUnavailable: when the editor bridge is not running
+        :raises BridgeError: when the bridge stops answering part way through the call
+        :return: BridgeResponse
+        """
+        if not self.is_alive():
+            raise BridgeUnavailable(f"Unreal bridge is not running on {self.host}:{self.port}")
+
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        request_headers = {"Accept-Encoding": "gzip"}
+        if body is not None:
+            request_headers["Content-Type"] = "application/json"
+        request_headers.update(headers or {})
+
+        while True:
+            connection, reused = self.acquire_connection()
+            try:
+                connection.request(method, path, body=body, headers=request_headers)
+                response = connection.getresponse()
+                data = response.read()
+            except socket.timeout as e:
+                # The editor is up but busy, leave it marked alive
+                connection.close()
+                raise BridgeError(f"Bridge did not answer {method} {path} within {self.read_timeout}s") from e
+            except (OSError, http.client.HTTPException) as e:
+                connection.close()
+                if reused and isinstance(e, STALE_CONNECTION_ERRORS):
+                    # The bridge closed this idle connection, try again on a fresh one
+                    continue
+                self.set_alive(False)
+                raise BridgeUnavailable(f"Lost connection to the Unreal bridge: {e}") from e
+            break
+
+        if response.will_close:
+            connection.close()
+        else:
+            self.release_connection(connection)
+        self.set_alive(True)
+
+        if response.getheader("Content-Encoding") == "gzip":
+            data = gzip.decompress(data)
+        return BridgeResponse(response.status, response.headers, data)
+
+    def send(self, method, path, payload=None):
+        """
+        Makes a call and decodes its result, in the compact columnar gzipped form asked for with BRIDGE_HEADERS.
+        A full bridge queue is waited out, retrying after the Retry-After it asks for, for up to BRIDGE_BUSY_TIMEOUT
+        :raises BridgeError: when the bridge answers with an error status
+        :return: decoded body
+        """
+        deadline = time.monotonic() + BRIDGE_BUSY_TIMEOUT
+        response = self.request(method, path, payload, headers=BRIDGE_HEADERS)
+        while response.status == 503 and time.monotonic() < deadline:
+            try:
+                retry_after = float(response.headers.get("Retry-After", 1))
+            except ValueError:
+                retry_after = 1.0
+            time.sleep(max(0.1, min(retry_after, deadline - time.monotonic())))
+            response = self.request(method, path, payload, headers=BRIDGE_HEADERS)
+        response.raise_for_status()
+        return read_bridge_response(response)
+
+    def iter_lines(self, path):
+        """
+        Reads a streamed response line by line on its own connection, which the bridge closes when the stream ends
+        :param path: bridge path, ie "/jobs/3/events"
+        :return: generator of decoded lines without line endings
+        """
+        if not self.is_alive():
+            raise BridgeUnavailable(f"Unreal bridge is not running on {self.host}:{self.port}")
+
+        connection = self.open_connection()
+        try:
+            connection.request("GET", path, headers={"Accept": "text/event-stream"})
+            response = connection.getresponse()
+            if response.status >= 400:
+                raise BridgeError(f"Bridge returned {response.status} for {path}", status=response.status)
+            for line in response:
+                yield line.decode("utf-8").rstrip("\r\n")
+        finally:
+            connection.close()
+
+
+bridge_client = BridgeClient()
+
+
+class BridgeCallResult(object):
+    """
+    Placeholder handed out by BridgeBatch.call, filled in once the batch has been sent
+    """
+    def __init__(self, function):
+        self.function = function
+        self.result = None
+        self.error = None
+        self.done = False
+
+
+class BridgeBatch(object):
+    """
+    Collects bridge calls and sends them as a single POST, which Unreal runs back to back in one tick.
+    The batch is sent automatically once max_calls are collected and when the with block exits:
+
+    with BridgeBatch() as batch:
+        skeletons = batch.call("unreal_tools.get_skeletons.get_all_assets_of_type", "Skeleton", "/Game/")
+    print(skeletons.result)
+    """
+    def __init__(self, max_calls=32):
+        self.max_calls = max_calls
+        self.pending = []
+
+    def call(self, function, *args, **kwargs):
+        """
+        Queues a call for the next send
+        :param function: dotted path to the function in Unreal, ie "unreal_tools.get_skeletons.get_all_assets_of_type"
+        :return: BridgeCallResult that holds the result or error after the batch is sent
+        """
+        placeholder = BridgeCallResult(function)
+        self.pending.append([{"function": function, "args": list(args), "kwargs": kwargs}, placeholder])
+        if len(self.pending) >= self.max_calls:
+            self.send()
+        return placeholder
+
+    def send(self):
+        """
+        Sends every pending call in one round-trip and fills in their placeholders
+        :return: list of BridgeCallResult in the order they were queued
+        """
+        pending, self.pending = self.pending, []
+        if not pending:
+            return []
+
+        results = run_bridge_batch([payload for payload, placeholder in pending])
+        for (payload, placeholder), entry in zip(pending, results):
+            placeholder.result = entry.get("result")
+            placeholder.error = entry.get("error")
+            placeholder.done = True
+        return [placeholder for payload, placeholder in pending]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.send()
+        return False
+
+
+def run_bridge_batch(calls):
+    """
+    Sends several bridge calls in one POST, Unreal runs them back to back in a single tick
+    :param calls: ordered list of {"function", "args", "kwargs"} payloads
+    :return: list with {"result": ...} or {"error": ...} for each call, in the same order
+    """
+    return bridge_client.send("POST", "/", calls)
+
+
+def submit_bridge_job(payload):
+    """
+    Queues a call on the bridge without waiting for it to run
+    :param payload: {"function", "args", "kwargs"} payload
+    :return: job id to poll, stream or cancel
+    """
+    return bridge_client.send("POST", "/jobs", payload)["id"]
+
+
+def get_bridge_job(job_id):
+    """
+    :param job_id: id returned by submit_bridge_job
+    :return: job status dictionary, includes "result" once the job is done
+    """
+    return bridge_client.send("GET", f"/jobs/{job_id}")
+
+
+def get_bridge_job_result(job_id):
+    """
+    :param job_id: id of a job that is done
+    :return: the job's result, sent on its own so record results can be packed as columns
+    """
+    return bridge_client.send("GET", f"/jobs/{job_id}/result")
+
+
+def cancel_bridge_job(job_id):
+    """
+    Cancels a job that is still waiting in the bridge queue
+    :param job_id: id returned by submit_bridge_job
+    :return: True if cancelled, False if it was already running or done
+    """
+    return bridge_client.request("DELETE", f"/jobs/{job_id}").status == 200
+
+
+def iter_bridge_job_events(job_id):
+    """
+    Follows the server-sent event stream for a job
+    :param job_id: id returned by submit_bridge_job
+    :return: generator of (event, data) tuples, ends once the job finishes, fails or is cancelled
+    """
+    event = "message"
+    for line in bridge_client.iter_lines(f"/jobs/{job_id}/events"):
+        if line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            yield event, json.loads(line[len("data:"):].strip())
+            event = "message"
+
+
+def run_bridge_job(payload, on_progress=None):
+    """
+    Submits a job, reports its progress as it runs in Unreal and returns its result.
+    If the event stream drops, the job keeps running in Unreal and is polled by id until it is done.
+    :param payload: {"function", "args", "kwargs"} payload
+    :param on_progress: optional callable given each progress payload yielded by the Unreal function
+    :return: the function's result
+    """
+    job_id = submit_bridge_job(payload)
+    try:
+        for event, data in iter_bridge_job_events(job_id):
+            if event == "progress" and on_progress:
+                on_progress(data)
+            elif event in JOB_DONE_STATUSES:
+                break
+    except (BridgeError, OSError, http.client.HTTPException) as e:
+        print(f"Lost progress stream for bridge job {job_id}, polling instead: {e}")
+
+    job = get_bridge_job(job_id)
+    while job["status"] not in JOB_DONE_STATUSES:
+        time.sleep(JOB_POLL_INTERVAL)
+        job = get_bridge_job(job_id)
+    return get_bridge_job_result(job_id)
+
+
+def get_worker_state_path(unreal_project_path, slot=0):
+    """
+    :return: file a headless worker for this project and slot writes its port to
+    """
+    project_dir = os.path.dirname(unreal_project_path)
+    return os.path.join(project_dir, "Saved", "TheEntireWorld", f"headless_worker_{slot}.json")
+
+
+class HeadlessWorker(object):
+    """
+    An UnrealEditor-Cmd process running headless_worker.py, booted once per project and slot and then kept warm
+    so fallback calls don't pay for an editor start each time. It exits on its own after WORKER_IDLE_TIMEOUT.
+    Workers started by another Maya or MotionBuilder session are found through their state file and reused
+    """
+    def __init__(self, unreal_project_path, unreal_command_path, slot=0):
+        self.unreal_project_path = unreal_project_path
+        self.unreal_command_path = unreal_command_path
+        self.slot = slot
+        self.state_path = get_worker_state_path(unreal_project_path, slot)
+        self.process = None
+        self.client = None
+
+    def connect(self):
+        """
+        :return: True if a worker for this slot is already running and answering
+        """
+        if self.client and self.client.is_alive():
+            return True
+        try:
+            with open(self.state_path, "r") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        client = BridgeClient(f"http://127.0.0.1:{state['port']}", timeout=WORKER_TIMEOUT, max_connections=1)
+        if client.is_alive(refresh=True):
+            self.client = client
+            return True
+        return False
+
+    def start(self):
+        """
+        Boots the worker unless one is already running for this slot, and waits until it takes calls
+        :raises BridgeUnavailable: when the editor exits or does not open its port within WORKER_START_TIMEOUT
+        """
+        if self.connect():
+            return
+        if self.process is None or self.process.poll() is not None:
+            if os.path.exists(self.state_path):
+                os.remove(self.state_path)
+            script_path = os.path.join(os.path.dirname(__file__), "headless_worker.py").replace('\\', '/')
+            env = dict(os.environ, TEW_WORKER_STATE_FILE=self.state_path,
+                       TEW_WORKER_IDLE_TIMEOUT=str(WORKER_IDLE_TIMEOUT))
+            unreal_cmd = [
+                self.unreal_command_path,
+                self.unreal_project_path,
+                "-run=pythonscript",
+                "-script=" + script_path
+            ]
+            # Output is left to the Unreal log, a pipe nobody reads would fill up and stall the worker
+            self.process = subprocess.Popen(unreal_cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        deadline = time.monotonic() + WORKER_START_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise BridgeUnavailable(f"Headless Unreal worker exited with code {self.process.returncode}")
+            if self.connect():
+                return
+            time.sleep(0.5)
+        raise BridgeUnavailable(f"Headless Unreal worker did not start within {WORKER_START_TIMEOUT}s")
+
+    def call(self, function, *args, **kwargs):
+        """
+        Runs a function in the worker, starting it first if needed
+        :param function: dotted path, one of headless_worker.WORKER_FUNCTIONS
+        :return: the function's result
+        """
+        self.start()
+        return self.client.send("POST", "/", {"function": function, "args": list(args), "kwargs": kwargs})
+
+    def shutdown(self):
+        if self.connect():
+            try:
+                self.client.request("POST", "/shutdown", {})
+            except BridgeError:
+                pass
+            self.client.close()
+        self.client = None
+
+
+headless_workers = {}
+
+
+def get_headless_worker(unreal_project_path, unreal_command_path, slot=0):
+    """
+    :param unreal_project_path: path to the unreal project
+    :param unreal_command_path: UnrealEditor-Cmd exe for the project's engine
+    :param slot: worker number, separate slots are separate editor processes that can run side by side
+    :return: HeadlessWorker for the project and slot, shared by every caller in this session
+    """
+    key = (os.path.normcase(os.path.abspath(unreal_project_path)), slot)
+    if key not in headless_workers:
+        headless_workers[key] = HeadlessWorker(unreal_project_path, unreal_command_path, slot=slot)
+    return headless_workers[key]
 
 
 def run_get_skeletons(unreal_project_path, log_file_path,
                               unreal_command_path="C:/Program Files/Epic "
                                                   "Games/UE_5.5/Engine/Binaries/Win64/UnrealEditor-Cmd.exe"):
     """
+    Asks the open editor, then a warm headless worker, and only then a one-off commandlet
     :param unreal_project_path: path to the unreal project
-    :param log_file_path: log file path for returning output (function exists to find this in unreal_project_data.py)
+    :param log_file_path: unused, commandlet results now come back through a result file. Kept for existing callers
     :param unreal_command_path: unreal cmd exe for version of editor (function exists to find this in unreal_project_data.py)
     :return:
     """
@@ -20,145 +542,284 @@ def run_get_skeletons(unreal_project_path, log_file_path,
             "args": ["Skeleton", "/Game/"]
             }
 
-        response = requests.post("http://127.0.0.1:12347", json=payload)
-        print(response.json())
-        return response.json()
-    except:
-        script_dir = os.path.dirname(__file__)
-        unreal_cmd = [
-            unreal_command_path,
-            unreal_project_path,
-            "-run=pythonscript",
-            "-script=" + script_dir + "/get_skeletons.py"
-        ]
-
-        try:
-            result = subprocess.run(unreal_cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        result = bridge_client.send("POST", "/", payload)
+        print(result)
+        return result
+    except BridgeUnavailable as e:
+        print(f"Unreal bridge unavailable, using a headless worker: {e}")
+    except BridgeError as e:
+        # The editor is up, a second editor on the same project would write the same packages
+        return f"Error: {e}"
 
-            '''print("STDOUT:\n", result.stdout)
-            print("STDERR:\n", result.stderr)'''
+    try:
+        worker = get_headless_worker(unreal_project_path, unreal_command_path)
+        return worker.call("unreal_tools.get_skeletons.get_all_assets_of_type", "Skeleton", "/Game/")
+    except BridgeUnavailable as e:
+        print(f"Headless Unreal worker unavailable, running a one-off commandlet: {e}")
+    except BridgeError as e:
+        return f"Error: {e}"
 
-            time.sleep(5)
+    return run_get_skeletons_commandlet(unreal_project_path, unreal_command_path)
 
-            with open(log_file_path, "r") as log_file:
-                log_data = log_file.read()
 
-                if "'class_name': 'Skeleton'" in log_data:
-                    start_index = log_data.find("{")
-                    end_index = log_data.rfind("}") + 1
+def run_commandlet_script(script_name, unreal_project_path, unreal_command_path, job_args=None, on_progress=None):
+    """
+    Runs one of our scripts in a one-off UnrealEditor-Cmd and reads the result file it writes through
+    commandlet_job as it finishes, so nothing waits on a fixed sleep or parses the Unreal log.
+    Arguments and result use files unique to this run, so any number of these can run at once
+    :param script_name: script file in unreal_tools, ie "get_skeletons.py"
+    :param job_args: json serializable arguments, read by the script with commandlet_job.read_job_spec
+    :param on_progress: optional callable given the progress payloads the script logs with its job tag,
+        only the new part of the log is read on each poll
+    :return: the script's result, or an "Error: ..." string like the other fallbacks
+    """
+    script_path = os.path.join(os.path.dirname(__file__), script_name).replace('\\', '/')
+    job_id = uuid.uuid4().hex
+    spec_path = os.path.join(tempfile.gettempdir(), f"tew_job_{job_id}.json")
+    result_path = os.path.join(tempfile.gettempdir(), f"tew_result_{job_id}.json")
+    with open(spec_path, "w") as f:
+        json.dump(job_args or {}, f)
+    env = dict(os.environ, TEW_JOB_SPEC=spec_path, TEW_JOB_RESULT=result_path, TEW_JOB_ID=job_id)
+
+    unreal_cmd = [
+        unreal_command_path,
+        unreal_project_path,
+        "-run=pythonscript",
+        "-script=" + script_path
+    ]
+
+    job_tag = f"[TEWJob {job_id}]"
+    # Log offsets are taken before launching, so nothing the commandlet logs early is skipped
+    log_tailer = unreal_project_data.UnrealLogTailer(unreal_project_path, job_tag=job_tag) if on_progress else None
+
+    # Output goes to the Unreal log, keeping the whole commandlet output in memory here would serve no purpose
+    process = subprocess.Popen(unreal_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env)
+    if log_tailer:
+        while True:
+            exited = process.poll() is not None
+            for line in log_tailer.read_lines():
+                try:
+                    on_progress(json.loads(line.split(job_tag, 1)[1]))
+                except ValueError:
+                    continue
+            if exited:
+                break
+            time.sleep(COMMANDLET_POLL_INTERVAL)
+    process.wait()
 
+    try:
+        with open(result_path, "r") as f:
+            job_result = json.load(f)
+    except (OSError, ValueError):
+        return f"Error: {script_name} exited with code {process.returncode} without a result, see the Unreal log"
+    finally:
+        for job_file in (spec_path, result_path):
+            if os.path.exists(job_file):
+                os.remove(job_file)
 
-                    relevant_data = log_data[start_index:end_index]
-                    return relevant_data
+    if job_result.get("error"):
+        return f"Error: {job_result['error']}"
+    return job_result.get("result")
 
-                # If no relevant data found, return a fallback message
-                return "No relevant asset dictionary found in the log."
 
-        except subprocess.CalledProcessError as e:
-            return f"Error: {e.stderr}"
+def run_get_skeletons_commandlet(unreal_project_path, unreal_command_path):
+    return run_commandlet_script("get_skeletons.py", unreal_project_path, unreal_command_path)
 
 
 def run_create_cinematic_sequence(anim_dict_path, destination_path, unreal_project_path, log_file_path,
-                                  unreal_command_path="C:/Program Files/Epic Games/UE_5.5/Engine/Binaries/Win64/UnrealEditor-Cmd.exe"):
+                                  unreal_command_path="C:/Program Files/Epic Games/UE_5.5/Engine/Binaries/Win64/UnrealEditor-Cmd.exe",
+                                  on_progress=None, workers=None):
+    """
+    Builds the sequence in the open editor, then a warm headless worker, and only then a one-off commandlet
+    :param on_progress: optional callable given each shot / animation progress payload while Unreal builds the sequence
+    :param workers: headless editors to import the shots' animations in first, defaults to CINEMATIC_IMPORT_WORKERS
+    """
+    workers = CINEMATIC_IMPORT_WORKERS if workers is None else workers
+    if workers > 1:
+        return run_create_cinematic_sequence_sharded(anim_dict_path, destination_path, unreal_project_path,
+                                                     unreal_command_path, workers, on_progress=on_progress)
+
     try:
         payload = {
             "function": "unreal_tools.sequence_importer.create_cinematic_sequence_from_json",
             "args": [anim_dict_path, destination_path],
             "kwargs": {
-                "from_cmd": False
+                "from_cmd": False,
+                "cooperative": True
             }
         }
 
-        response = requests.post("http://127.0.0.1:12347", json=payload)
-        print(response.json())
-        return response.json()
-    except:
-        script_dir = os.path.dirname(__file__)
-        script_path = os.path.join(script_dir, "sequence_func.py").replace('\\', '/')
+        result = run_bridge_job(payload, on_progress=on_progress)
+        print(result)
+        return result
+    except BridgeUnavailable as e:
+        print(f"Unreal bridge unavailable, using a headless worker: {e}")
+    except BridgeError as e:
+        # The editor is up, a second editor on the same project would write the same packages
+        return f"Error: {e}"
 
-        # Write arguments to a temp file
-        temp_args_file = "C:/temp/sequence_args.json"
-
-        os.makedirs(os.path.dirname(temp_args_file), exist_ok=True)
-
-        with open(temp_args_file, "w") as f:
-            json.dump({
-                "anim_dict_path": anim_dict_path,
-                "destination_path": destination_path
-            }, f)
+    try:
+        worker = get_headless_worker(unreal_project_path, unreal_command_path)
+        return worker.call("unreal_tools.sequence_importer.create_cinematic_sequence_from_json",
+                           anim_dict_path, destination_path)
+    except BridgeUnavailable as e:
+        print(f"Headless Unreal worker unavailable, running a one-off commandlet: {e}")
+    except BridgeError as e:
+        return f"Error: {e}"
 
-        unreal_cmd = [
-            unreal_command_path,
-            unreal_project_path,
-            "-run=pythonscript",
-            "-script=" + script_path
-        ]
+    return run_create_cinematic_sequence_commandlet(anim_dict_path, destination_path, unreal_project_path,
+                                                    unreal_command_path, on_progress=on_progress)
 
-        try:
-            result = subprocess.run(unreal_cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            '''print("STDOUT:\n", result.stdout)
-            print("STDERR:\n", result.stderr)'''
 
-            time.sleep(5)
+def count_shot_imports(animations):
+    """
+    :return: number of FBX imports a shot needs, cameras and facial sliders are keyed into the sequence instead
+    """
+    return len([animation for animation in animations
+                if animation["name_space"] != "CAM" and "FacialSliders" not in animation["export_path"]])
 
-            if os.path.exists(log_file_path):
-                with open(log_file_path, "r") as log_file:
-                    log_data = log_file.read()
-                    print("Log Output:\n", log_data)
-                    return log_data
 
-            return "Log file not found."
+def split_shots(anim_dict, shard_count):
+    """
+    Deals shots out so every shard gets about the same number of FBX imports, biggest shots first
+    :param anim_dict: sequence json, shot name -> animations
+    :param shard_count: number of shards wanted
+    :return: list of shot name lists, each in sequence order, without empty shards
+    """
+    shot_order = list(anim_dict)
+    shards = [[0, []] for _ in range(max(1, shard_count))]
+    for shot_name in sorted(shot_order, key=lambda shot: -count_shot_imports(anim_dict[shot])):
+        shard = min(shards, key=lambda entry: entry[0])
+        shard[0] += max(1, count_shot_imports(anim_dict[shot_name]))
+        shard[1].append(shot_name)
+    return [sorted(shot_names, key=shot_order.index) for import_count, shot_names in shards if shot_names]
 
-        except subprocess.CalledProcessError as e:
-            return f"Error: {e.stderr}"
 
+def run_create_cinematic_sequence_sharded(anim_dict_path, destination_path, unreal_project_path, unreal_command_path,
+                                          workers, on_progress=None):
+    """
+    Imports the shots' FBX animations in several headless editors at once, then builds the sequence in one editor,
+    the open one if there is one, reusing those imports. Shot sub-sequences and their bindings are still built by
+    that one editor, because possessables bind to actors it spawns into its level and only one editor can save it.
+    A shard that fails just leaves its shots to be imported while the sequence is built
+    :param workers: number of headless editors, worker slots 0 to workers - 1
+    :param on_progress: optional callable given progress payloads as shards finish and then as the sequence is built
+    :return: path to the master sequence, or an "Error: ..." message
+    """
+    anim_dict = read_json_file(anim_dict_path)
+    shards = split_shots(anim_dict, workers)
+    total_imports = sum(count_shot_imports(animations) for animations in anim_dict.values())
+    imported_animations = {}
+    lock = threading.Lock()
 
-def run_import_gameplay_animations(anim_dict_path, unreal_project_path, log_file_path,
-                                  unreal_command_path="C:/Program Files/Epic Games/UE_5.5/Engine/Binaries/Win64/UnrealEditor-Cmd.exe"):
+    def import_shard(slot, shot_names):
+        try:
+            worker = get_headless_worker(unreal_project_path, unreal_command_path, slot=slot)
+            result = worker.call("unreal_tools.sequence_importer.import_shot_animations_from_json",
+                                 anim_dict_path, shot_names, destination_path)
+        except BridgeError as e:
+            print(f"Import shard {slot} failed, its shots are imported while building the sequence: {e}")
+            result = {}
+        with lock:
+            imported_animations.update(result)
+            if on_progress:
+                on_progress({"shot": ", ".join(shot_names), "animation": None,
+                             "completed_animations": len(imported_animations), "total_animations": total_imports})
+
+    threads = [threading.Thread(target=import_shard, args=(slot, shot_names), daemon=True)
+               for slot, shot_names in enumerate(shards)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    function = "unreal_tools.sequence_importer.create_cinematic_sequence_from_json"
     try:
         payload = {
-            "function": "unreal_tools.sequence_importer.import_gameplay_animations_from_json",
-            "args": [anim_dict_path]
+            "function": function,
+            "args": [anim_dict_path, destination_path],
+            "kwargs": {
+                "from_cmd": False,
+                "cooperative": True,
+                "imported_animations": imported_animations
             }
+        }
+        return run_bridge_job(payload, on_progress=on_progress)
+    except BridgeUnavailable as e:
+        print(f"Unreal bridge unavailable, building the sequence in a headless worker: {e}")
+    except BridgeError as e:
+        # The editor is up, a second editor on the same project would write the same packages
+        return f"Error: {e}"
 
-        response = requests.post("http://127.0.0.1:12347", json=payload)
-        print(response.json())
-        return response.json()
-    except:
-        script_dir = os.path.dirname(__file__)
-        script_path = os.path.join(script_dir, "gameplay_import_func.py").replace('\\', '/')
+    try:
+        worker = get_headless_worker(unreal_project_path, unreal_command_path)
+        return worker.call(function, anim_dict_path, destination_path, imported_animations=imported_animations)
+    except BridgeUnavailable as e:
+        print(f"Headless Unreal worker unavailable, running a one-off commandlet: {e}")
+    except BridgeError as e:
+        return f"Error: {e}"
 
-        # Write arguments to a temp file
-        temp_args_file = "C:/temp/gameplay_animation_args.json"
+    # The commandlet imports again, the animations the shards already imported are skipped as unchanged
+    return run_create_cinematic_sequence_commandlet(anim_dict_path, destination_path, unreal_project_path,
+                                                    unreal_command_path, on_progress=on_progress)
 
-        os.makedirs(os.path.dirname(temp_args_file), exist_ok=True)
 
-        with open(temp_args_file, "w") as f:
-            json.dump({
-                "anim_dict_path": anim_dict_path,
-            }, f)
+def read_json_file(file_path):
+    with open(file_path, "r") as f:
+        return json.load(f)
 
-        unreal_cmd = [
-            unreal_command_path,
-            unreal_project_path,
-            "-run=pythonscript",
-            "-script=" + script_path
-        ]
 
-        try:
-            result = subprocess.run(unreal_cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            '''print("STDOUT:\n", result.stdout)
-            print("STDERR:\n", result.stderr)'''
+def run_create_cinematic_sequence_commandlet(anim_dict_path, destination_path, unreal_project_path,
+                                             unreal_command_path, on_progress=None):
+    job_args = {
+        "anim_dict_path": anim_dict_path,
+        "destination_path": destination_path
+    }
+    return run_commandlet_script("sequence_func.py", unreal_project_path, unreal_command_path, job_args,
+                                 on_progress=on_progress)
 
-            time.sleep(5)
 
-            if os.path.exists(log_file_path):
-                with open(log_file_path, "r") as log_file:
-                    log_data = log_file.read()
-                    print("Log Output:\n", log_data)
-                    return log_data
+def run_import_gameplay_animations(anim_dict_path, unreal_project_path, log_file_path,
+                                  unreal_command_path="C:/Program Files/Epic Games/UE_5.5/Engine/Binaries/Win64/UnrealEditor-Cmd.exe",
+                                  on_progress=None):
+    """
+    Imports in the open editor, then a warm headless worker, and only then a one-off commandlet
+    :param on_progress: optional callable given each animation progress payload while Unreal imports
+    """
+    try:
+        payload = {
+            "function": "unreal_tools.sequence_importer.import_gameplay_animations_from_json",
+            "args": [anim_dict_path],
+            "kwargs": {
+                "cooperative": True
+            }
+            }
 
-            return "Log file not found."
+        result = run_bridge_job(payload, on_progress=on_progress)
+        print(result)
+        return result
+    except BridgeUnavailable as e:
+        print(f"Unreal bridge unavailable, using a headless worker: {e}")
+    except BridgeError as e:
+        # The editor is up, a second editor on the same project would write the same packages
+        return f"Error: {e}"
 
-        except subprocess.CalledProcessError as e:
-            return f"Error: {e.stderr}"
+    try:
+        worker = get_headless_worker(unreal_project_path, unreal_command_path)
+        return worker.call("unreal_tools.sequence_importer.import_gameplay_animations_from_json", anim_dict_path)
+    except BridgeUnavailable as e:
+        print(f"Headless Unreal worker unavailable, running a one-off commandlet: {e}")
+    except BridgeError as e:
+        return f"Error: {e}"
+
+    return run_import_gameplay_animations_commandlet(anim_dict_path, unreal_project_path, unreal_command_path,
+                                                     on_progress=on_progress)
+
+
+def run_import_gameplay_animations_commandlet(anim_dict_path, unreal_project_path, unreal_command_path,
+                                              on_progress=None):
+    job_args = {
+        "anim_dict_path": anim_dict_path,
+    }
+    return run_commandlet_script("gameplay_import_func.py", unreal_project_path, unreal_command_path, job_args,
+                                 on_progress=on_progress)
@@ -1,4 +1,5 @@
 import json
+import os
 
 
 def load_json_as_dict(file_path):
@@ -29,3 +30,24 @@ def save_dict_to_json(data, file_path):
     with open(file_path, 'w') as file:
         json.dump(data, file, indent=4)
 
+
+def write_json_atomic(data, file_path, indent=None, default=None):
+    """
+    Writes json to a temp file next to file_path and swaps it in, so a reader in another process never sees
+    half a file
+    :param data: json serializable data
+    :param file_path: path to write
+    :param indent: passed on to json.dump
+    :param default: passed on to json.dump, ie str for values json can't encode
+    :return: file_path
+    """
+    temp_path = f"{file_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'w') as file:
+            json.dump(data, file, indent=indent, default=default)
+        os.replace(temp_path, file_path)
+    except (OSError, TypeError, ValueError):
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return file_path